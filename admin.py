@@ -1,19 +1,45 @@
+import csv
+import io
 from functools import wraps
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from catalog import bump_catalog_version
+from metrics import metrics
+from sqlalchemy import select, update
 from models import db, User, UserLike, Pokemon
+from pagination import MAX_PER_PAGE, InvalidCursor, keyset_page, keyset_slice
+from profiles import rebuild_profiles_for_pokemon
+from rec_cache import recommendation_cache
+from search_index import get_search_index
+from serializers import (POKEMON_FIELDS, encode_json, json_response, parse_fields, pokemon_columns, pokemon_dicts,
+                         rows_to_dicts)
+from snapshot import get_catalog_snapshot
+from tag_index import TAG_COLUMNS, sync_pokemon_tags
+from user_cache import claims_match, user_cache
 
 admin_bp = Blueprint('admin', __name__)
 
+EXPORT_BATCH_SIZE = 500 # 내보내기에서 DB 커서로 한 번에 가져오는 행 수
+MAX_BULK_PATCHES = 1000 # 한 번의 일괄 수정 요청에서 처리할 수 있는 최대 포켓몬 수
+# 일괄 수정할 수 없는 컬럼 (식별자, 자동으로 관리되는 컬럼)
+READ_ONLY_COLUMNS = ('id', 'pokemon_id', 'row_version', 'updated_at')
+
 def admin_required():
-    """관리자만 접근을 허용하는 데코레이터"""
+    """관리자만 접근을 허용하는 데코레이터
+
+    토큰의 is_admin claim으로 먼저 거르고, 캐시된 사용자 레코드로 권한과 토큰 버전(폐기 여부)을 확인합니다.
+    """
     def wrapper(fn):
         @wraps(fn)
         @jwt_required()
         def decorator(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            user = User.query.get(current_user_id)
-            if user and user.is_admin:
+            claims = get_jwt()
+            if not claims.get('is_admin'):
+                return jsonify(msg="관리자 권한이 필요합니다."), 403
+            user = user_cache.get(get_jwt_identity())
+            if not claims_match(claims, user):
+                return jsonify(msg="토큰이 만료되었습니다. 다시 로그인하세요."), 401
+            if user['is_admin']:
                 return fn(*args, **kwargs)
             else:
                 return jsonify(msg="관리자 권한이 필요합니다."), 403
@@ -36,53 +62,212 @@ def get_user_details(user_id):
     if not user:
         return jsonify(msg="사용자를 찾을 수 없습니다."), 404
     
-    liked_pokemon_ids = [like.pokemon_id for like in user.likes]
-    liked_pokemon = Pokemon.query.filter(Pokemon.pokemon_id.in_(liked_pokemon_ids)).all()
+    liked_pokemon_ids = db.session.query(UserLike.pokemon_id).filter_by(user_id=user.id)
+    liked_pokemon = Pokemon.query.filter(Pokemon.pokemon_id.in_(liked_pokemon_ids))
 
-    return jsonify({
+    return json_response({
         'id': user.id,
         'username': user.username,
         'is_admin': user.is_admin,
-        'likes': [p.to_dict() for p in liked_pokemon]
+        'likes': pokemon_dicts(liked_pokemon, parse_fields(request.args.get('fields')))
     })
 
 # --- Pokemon Management ---
 @admin_bp.route('/pokemon', methods=['GET'])
 @admin_required()
 def get_all_pokemon():
-    """페이지네이션 및 검색 기능이 포함된 모든 포켓몬 목록을 반환합니다."""
+    """페이지네이션 및 검색 기능이 포함된 모든 포켓몬 목록을 pokemon_id 순으로 반환합니다.
+
+    cursor 값을 보내면(첫 페이지는 빈 값) OFFSET 없이 커서 다음 페이지를 조회하고 next_cursor를 함께 반환합니다.
+    """
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     search = request.args.get('search', '', type=str)
+    # 수정 화면에서 전체 필드를 쓰므로 기본값은 전체 컬럼입니다.
+    fields = parse_fields(request.args.get('fields'), default=POKEMON_FIELDS)
 
     query = Pokemon.query
+    # 검색 결과는 id 목록에서 먼저 한 페이지만 잘라 그 id들만 조회합니다. (넓은 검색어도 IN (...)이 페이지 크기를 넘지 않음)
+    matched_ids = get_search_index().match_ids(search) if search else None
+    total_items = len(matched_ids) if search else len(get_catalog_snapshot())
+
+    if 'cursor' in request.args:
+        per_page = min(per_page, MAX_PER_PAGE)
+        try:
+            if search:
+                page_ids, next_cursor = keyset_slice(matched_ids, request.args['cursor'], per_page)
+                rows = (query.filter(Pokemon.pokemon_id.in_(page_ids)).with_entities(*pokemon_columns(fields))
+                        .order_by(Pokemon.pokemon_id).all())
+            else:
+                rows, next_cursor = keyset_page(query, Pokemon.pokemon_id, pokemon_columns(fields),
+                                                request.args['cursor'], per_page)
+        except InvalidCursor:
+            return jsonify(msg="잘못된 페이지 커서입니다."), 400
+        return json_response({
+            'pokemon': rows_to_dicts(rows, fields),
+            'total_items': total_items,
+            'per_page': per_page,
+            'next_cursor': next_cursor
+        })
+
     if search:
-        query = query.filter(Pokemon.name_ko.like(f"%{search}%"))
-    
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    
-    return jsonify({
-        'pokemon': [p.to_dict() for p in pagination.items],
-        'total_items': pagination.total,
-        'page': pagination.page,
-        'per_page': pagination.per_page,
-        'total_pages': pagination.pages
+        page = max(page, 1)
+        per_page = per_page if per_page >= 1 else 20
+        page_ids = matched_ids[(page - 1) * per_page:page * per_page]
+        items = (query.filter(Pokemon.pokemon_id.in_(page_ids)).with_entities(*pokemon_columns(fields))
+                 .order_by(Pokemon.pokemon_id).all())
+    else:
+        pagination = (query.with_entities(*pokemon_columns(fields)).order_by(Pokemon.pokemon_id)
+                      .paginate(page=page, per_page=per_page, error_out=False, count=False))
+        page, per_page, items = pagination.page, pagination.per_page, pagination.items
+
+    return json_response({
+        'pokemon': rows_to_dicts(items, fields),
+        'total_items': total_items,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': (total_items + per_page - 1) // per_page
     })
 
+@admin_bp.route('/pokemon/export', methods=['GET'])
+@admin_required()
+def export_pokemon():
+    """전체 포켓몬을 pokemon_id 순으로 NDJSON(기본값) 또는 CSV(format=csv)로 스트리밍합니다.
+
+    EXPORT_BATCH_SIZE행씩 서버 측 커서(yield_per)로 읽어 바로 내보내므로 카탈로그 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify(msg="format은 ndjson 또는 csv여야 합니다."), 400
+    fields = parse_fields(request.args.get('fields'), default=POKEMON_FIELDS)
+
+    def generate():
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+            yield buffer.getvalue().encode('utf-8-sig') # 엑셀에서 한글이 깨지지 않도록 BOM을 붙입니다.
+        statement = select(*pokemon_columns(fields)).order_by(Pokemon.pokemon_id)
+        result = db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            if export_format == 'csv':
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                yield buffer.getvalue().encode('utf-8')
+            else:
+                yield b''.join(encode_json(dict(zip(fields, row))) + b'\n' for row in rows)
+
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=pokemon.{export_format}'
+    return response
+
+def validate_patch(patch, columns):
+    """일괄 수정 항목 하나를 검사해 오류 메시지를 반환합니다. 문제가 없으면 None."""
+    if not isinstance(patch, dict):
+        return "각 항목은 객체여야 합니다."
+    pokemon_id = patch.get('pokemon_id')
+    if not isinstance(pokemon_id, int) or isinstance(pokemon_id, bool):
+        return "pokemon_id(정수)가 필요합니다."
+    if 'row_version' in patch and (not isinstance(patch['row_version'], int) or isinstance(patch['row_version'], bool)):
+        return "row_version은 정수여야 합니다."
+    changes = {key: value for key, value in patch.items() if key not in ('pokemon_id', 'row_version')}
+    if not changes:
+        return "수정할 필드가 없습니다."
+    for key, value in changes.items():
+        column = columns.get(key)
+        if column is None:
+            return f"수정할 수 없는 필드입니다: {key}"
+        if value is None:
+            if not column.nullable:
+                return f"{key}은(는) 비워 둘 수 없습니다."
+        elif isinstance(column.type, db.Integer):
+            if not isinstance(value, int) or isinstance(value, bool):
+                return f"{key}은(는) 정수여야 합니다."
+        elif not isinstance(value, str):
+            return f"{key}은(는) 문자열이어야 합니다."
+    return None
+
+@admin_bp.route('/pokemon/bulk', methods=['PATCH'])
+@admin_required()
+def bulk_update_pokemon():
+    """{"patches": [{"pokemon_id": 25, "type": "전기", ...}, ...]}의 수정 사항을 한 트랜잭션으로 적용합니다.
+
+    모든 항목을 먼저 검사하고 하나라도 잘못되었으면 아무것도 바꾸지 않습니다. 항목에 row_version을 넣으면
+    현재 값과 다를 때(그 사이 다른 사람이 수정함) 트랜잭션 전체를 되돌리고 409로 거부합니다.
+    """
+    patches = (request.get_json(silent=True) or {}).get('patches')
+    if not isinstance(patches, list) or not patches:
+        return jsonify(msg="patches 목록이 필요합니다."), 400
+    if len(patches) > MAX_BULK_PATCHES:
+        return jsonify(msg=f"한 번에 최대 {MAX_BULK_PATCHES}개까지 수정할 수 있습니다."), 400
+
+    columns = {column.name: column for column in Pokemon.__table__.columns if column.name not in READ_ONLY_COLUMNS}
+    errors = []
+    for index, patch in enumerate(patches):
+        error = validate_patch(patch, columns)
+        if error:
+            errors.append({'index': index, 'error': error})
+    if not errors:
+        pokemon_ids = [patch['pokemon_id'] for patch in patches]
+        if len(set(pokemon_ids)) != len(pokemon_ids):
+            return jsonify(msg="같은 포켓몬이 여러 번 들어 있습니다."), 400
+        current = {pokemon_id: row_id for row_id, pokemon_id in db.session.query(
+            Pokemon.id, Pokemon.pokemon_id).filter(Pokemon.pokemon_id.in_(pokemon_ids))}
+        errors = [{'index': index, 'error': f"포켓몬을 찾을 수 없습니다: {patch['pokemon_id']}"}
+                  for index, patch in enumerate(patches) if patch['pokemon_id'] not in current]
+    if errors:
+        return jsonify(msg="잘못된 수정 항목이 있습니다.", errors=errors), 400
+
+    def changes(patch):
+        return {key: value for key, value in patch.items() if key not in ('pokemon_id', 'row_version')}
+
+    # row_version이 있는 항목은 검사와 쓰기를 한 문장(UPDATE ... WHERE row_version = 기대값)으로 처리해,
+    # 읽은 뒤 쓰기 전에 끼어든 수정도 놓치지 않습니다. 하나라도 맞지 않으면 전체를 되돌립니다.
+    conflicts = []
+    for patch in patches:
+        if 'row_version' in patch:
+            result = db.session.execute(
+                update(Pokemon)
+                .where(Pokemon.pokemon_id == patch['pokemon_id'], Pokemon.row_version == patch['row_version'])
+                .values(**changes(patch))
+                .execution_options(synchronize_session=False))
+            if result.rowcount != 1:
+                conflicts.append(patch['pokemon_id'])
+    if conflicts:
+        db.session.rollback()
+        return jsonify(msg="다른 곳에서 먼저 수정된 포켓몬이 있습니다.", conflicts=conflicts), 409
+
+    # 나머지는 기본 키(id) 기준 일괄 UPDATE (같은 필드 조합끼리 executemany로 묶입니다)
+    mappings = [{'id': current[patch['pokemon_id']], **changes(patch)}
+                for patch in patches if 'row_version' not in patch]
+    if mappings:
+        db.session.execute(update(Pokemon), mappings)
+    retagged_ids = [patch['pokemon_id'] for patch in patches if any(column in patch for column in TAG_COLUMNS)]
+    if retagged_ids:
+        sync_pokemon_tags(retagged_ids)
+        rebuild_profiles_for_pokemon(retagged_ids)
+    db.session.commit()
+    bump_catalog_version()
+    return jsonify(updated=len(patches), pokemon_ids=pokemon_ids)
+
 @admin_bp.route('/pokemon/<int:id>', methods=['PUT'])
 @admin_required()
 def update_pokemon(id):
-    """특정 포켓몬의 정보를 업데이트합니다."""
+    """특정 포켓몬의 정보를 업데이트합니다. id, pokemon_id 등 READ_ONLY_COLUMNS는 보내도 바뀌지 않습니다."""
     pokemon = Pokemon.query.get(id)
     if not pokemon:
         return jsonify(msg="포켓몬을 찾을 수 없습니다."), 404
         
     data = request.json
     for key, value in data.items():
-        if hasattr(pokemon, key):
+        if key in Pokemon.__table__.columns and key not in READ_ONLY_COLUMNS:
             setattr(pokemon, key, value)
             
+    sync_pokemon_tags([pokemon.pokemon_id])
+    rebuild_profiles_for_pokemon([pokemon.pokemon_id])
     db.session.commit()
+    bump_catalog_version()
     return jsonify(pokemon.to_dict())
 
 @admin_bp.route('/pokemon/<int:id>', methods=['DELETE'])
@@ -94,5 +279,21 @@ def delete_pokemon(id):
         return jsonify(msg="포켓몬을 찾을 수 없습니다."), 404
         
     db.session.delete(pokemon)
+    db.session.flush()
+    rebuild_profiles_for_pokemon([pokemon.pokemon_id])
     db.session.commit()
+    bump_catalog_version()
     return jsonify(msg="포켓몬이 삭제되었습니다.")
+
+# --- Cache ---
+@admin_bp.route('/cache/stats', methods=['GET'])
+@admin_required()
+def get_cache_stats():
+    """개인화 추천 결과 캐시의 적중/실패 횟수와 상태를 반환합니다."""
+    return jsonify(recommendation_cache.stats())
+
+@admin_bp.route('/metrics', methods=['GET'])
+@admin_required()
+def get_metrics():
+    """엔드포인트별 처리 시간, SQL 쿼리 수, 응답 크기 통계를 Prometheus 텍스트 형식으로 반환합니다."""
+    return Response(metrics.prometheus(), mimetype='text/plain; version=0.0.4')
@@ -1,9 +1,16 @@
 from flask import Blueprint, request, jsonify
 from models import db, User, UserLike
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from passwords import PasswordHasherBusy, password_hasher
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
+from user_cache import claims_match, token_claims, user_cache
 
 auth_bp = Blueprint('auth', __name__)
 
+def busy_response():
+    response = jsonify({"msg": "요청이 많습니다. 잠시 후 다시 시도하세요."})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """사용자 등록"""
@@ -18,7 +25,10 @@ def register():
         return jsonify({"msg": "이미 존재하는 사용자 이름입니다."}), 409
 
     new_user = User(username=username)
-    new_user.set_password(password)
+    try:
+        new_user.set_password(password)
+    except PasswordHasherBusy:
+        return busy_response()
     db.session.add(new_user)
     db.session.commit()
 
@@ -33,8 +43,20 @@ def login():
 
     user = User.query.filter_by(username=username).first()
 
-    if user and user.check_password(password):
-        access_token = create_access_token(identity=str(user.id))
+    try:
+        valid = user is not None and user.check_password(password)
+    except PasswordHasherBusy:
+        return busy_response()
+
+    if valid:
+        if password_hasher.needs_rehash(user.password_hash):
+            # 해시 비용(BCRYPT_LOG_ROUNDS) 설정이 바뀌었으면 새 비용으로 다시 저장합니다.
+            try:
+                user.set_password(password)
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass # 다음 로그인 때 다시 시도합니다.
+        access_token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
         return jsonify(access_token=access_token)
 
     return jsonify({"msg": "사용자 이름 또는 비밀번호가 잘못되었습니다."}), 401
@@ -43,8 +65,9 @@ def login():
 @jwt_required()
 def get_me():
     """현재 로그인된 사용자 정보 반환"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    if user:
-        return jsonify({"id": user.id, "username": user.username, "is_admin": user.is_admin})
-    return jsonify({"msg": "사용자를 찾을 수 없습니다."}), 404
+    user = user_cache.get(get_jwt_identity())
+    if user is None:
+        return jsonify({"msg": "사용자를 찾을 수 없습니다."}), 404
+    if not claims_match(get_jwt(), user):
+        return jsonify({"msg": "토큰이 만료되었습니다. 다시 로그인하세요."}), 401
+    return jsonify({"id": user['id'], "username": user['username'], "is_admin": user['is_admin']})
@@ -0,0 +1,4 @@
+"""API 주요 경로 성능 측정 도구 (합성 카탈로그, 마이크로 벤치마크, 부하 생성기)
+
+    python -m benchmarks.run --sizes 1000,10000
+"""
@@ -0,0 +1,92 @@
+"""동시 요청 부하 생성기
+
+실행 중인 서버에 요청하거나(--url), 서버 없이 앱을 직접 호출합니다. (스레드별 Flask 테스트 클라이언트)
+
+    python -m benchmarks.load --url http://127.0.0.1:5000 --concurrency 16 --duration 30
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from benchmarks.timing import summarize
+
+RECOMMEND_UNFILTERED = {'filters': {}, 'page': 1, 'per_page': 20}
+RECOMMEND_FILTERED = {'filters': {'type': ['물']}, 'page': 2, 'per_page': 20}
+
+# (가중치, 메서드, 경로, JSON 본문) - 실제 화면의 요청 비율과 비슷하게
+DEFAULT_SCENARIO = [
+    (5, 'POST', '/api/recommend', RECOMMEND_UNFILTERED),
+    (3, 'POST', '/api/recommend', RECOMMEND_FILTERED),
+    (2, 'GET', '/api/filters', None),
+    (2, 'GET', '/api/search/autocomplete?q=피카', None),
+    (1, 'GET', '/api/pokemon/25', None),
+]
+
+
+class _UrlClient:
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def request(self, method, path, body, headers):
+        response = self.session.request(method, self.base_url + path, json=body, headers=headers, timeout=30)
+        return response.status_code
+
+
+class _AppClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body, headers):
+        return self.client.open(path, method=method, json=body, headers=headers).status_code
+
+
+def run_load(make_client, scenario=DEFAULT_SCENARIO, concurrency=8, duration=10.0, headers=None, seed=0):
+    """concurrency개 스레드가 duration초 동안 시나리오의 요청을 반복하고 처리량과 지연 시간 분포를 반환합니다."""
+    weights = [weight for weight, *_ in scenario]
+    samples, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(number):
+        rng = random.Random(seed + number)
+        client = make_client()
+        local_samples, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            _, method, path, body = rng.choices(scenario, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = client.request(method, path, body, headers or {})
+            except Exception:
+                status = 599
+            local_samples.append(time.perf_counter() - started)
+            local_errors += status >= 400
+        with lock:
+            samples.extend(local_samples)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result = summarize(samples, elapsed=time.perf_counter() - started)
+    result.update({'concurrency': concurrency, 'errors': errors[0]})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실행 중인 서버에 동시 요청을 보내 처리량과 p50/p95/p99를 측정합니다.")
+    parser.add_argument('--url', required=True, help="서버 주소 (예: http://127.0.0.1:5000)")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help="초")
+    args = parser.parse_args()
+    result = run_load(lambda: _UrlClient(args.url), concurrency=args.concurrency, duration=args.duration)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
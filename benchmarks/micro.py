@@ -0,0 +1,96 @@
+import random
+from benchmarks.load import RECOMMEND_FILTERED, RECOMMEND_UNFILTERED
+from benchmarks.synthetic import ROLES, TYPES
+from benchmarks.timing import measure
+
+
+# app 모듈은 DATABASE_URL이 설정된 뒤에 불러와야 하므로 앱 관련 모듈은 함수 안에서 import합니다.
+
+def _auth_header(app, user_id):
+    from flask_jwt_extended import create_access_token
+    from models import User
+    from user_cache import token_claims
+    with app.app_context():
+        user = User.query.get(user_id)
+        token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _check(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.path} -> {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+def _recommend_body(filters, page=1, per_page=20):
+    return {'filters': filters, 'page': page, 'per_page': per_page}
+
+
+def _check_filters_applied(client, unfiltered_body, filtered_bodies):
+    """필터를 넣은 /api/recommend 요청 본문들이 필터 없는 요청보다 적은 결과를 받는지 확인합니다.
+
+    본문의 키가 틀리면 필터가 조용히 무시되어 태그 색인 교집합 경로를 전혀 측정하지 못합니다.
+    """
+    def total_items(body):
+        return _check(client.post('/api/recommend', json=body)).get_json()['total_items']
+
+    unfiltered = total_items(unfiltered_body)
+    for body in filtered_bodies:
+        if total_items(body) >= unfiltered:
+            raise RuntimeError(f"/api/recommend {body} returned as many results as no filters ({unfiltered})")
+
+
+def run_micro(app, likes, csv_path, repeat=50, seed=0):
+    """Flask 테스트 클라이언트로 주요 API와 함수를 측정해 {이름: 요약 통계}를 반환합니다."""
+    from catalog import bump_catalog_version
+    from importer import import_pokemon
+    from models import db, Pokemon, PokemonTag
+    from rec_cache import InProcessBackend, recommendation_cache
+
+    rng = random.Random(seed)
+    client = app.test_client()
+    results = {}
+
+    filter_choices = [{}, {'type': ['물']}, {'type': ['불꽃'], 'role': ['물리 공격형']},
+                      {'type': [TYPES[5][0], TYPES[9][0]]}, {'role': [ROLES[2][0]], 'feature': ['귀여움']}]
+    # 벤치마크와 부하 테스트가 보내는 본문 그대로 필터가 적용되는지 먼저 확인합니다.
+    _check_filters_applied(client, _recommend_body({}), [_recommend_body(filters) for filters in filter_choices if filters])
+    _check_filters_applied(client, RECOMMEND_UNFILTERED, [RECOMMEND_FILTERED])
+    results['recommend_api'] = measure(lambda: _check(client.post('/api/recommend', json=_recommend_body(
+        rng.choice(filter_choices), page=rng.randint(1, 5)))), repeat)
+
+    results['get_filters'] = measure(lambda: _check(client.get('/api/filters')), repeat)
+
+    # '좋아요' 수가 다양한 사용자들로 측정합니다. (좋아요 수 순으로 골고루)
+    users = sorted(likes, key=lambda user_id: len(likes[user_id]))
+    sample = [users[int(position * (len(users) - 1) / 9)] for position in range(10)]
+    headers = [_auth_header(app, user_id) for user_id in sample]
+
+    def personalized(clear_cache):
+        if clear_cache:
+            recommendation_cache.backend = InProcessBackend()
+        _check(client.post('/api/recommend/personalized', json={}, headers=rng.choice(headers)))
+
+    results['recommend_personalized'] = measure(lambda: personalized(True), repeat)
+    results['recommend_personalized_cached'] = measure(lambda: personalized(False), repeat)
+
+    def to_dict():
+        with app.app_context():
+            [pokemon.to_dict() for pokemon in Pokemon.query.limit(1000)]
+            db.session.remove()
+
+    results['to_dict_1000'] = measure(to_dict, max(repeat // 5, 3), warmup=1)
+
+    def reimport():
+        with app.app_context():
+            db.session.query(PokemonTag).delete()
+            db.session.query(Pokemon).delete()
+            db.session.commit()
+            import_pokemon(csv_path, fetch_descriptions=False)
+            db.session.remove()
+
+    # 임포트는 카탈로그 전체를 다시 쓰므로 마지막에 측정합니다.
+    results['import_pokemon'] = measure(reimport, repeat=3, warmup=0)
+    with app.app_context():
+        bump_catalog_version()
+    return results
@@ -0,0 +1,117 @@
+"""벤치마크 실행 및 기준값 비교
+
+임시 디렉터리의 SQLite DB에 크기별 합성 카탈로그를 만들고 마이크로 벤치마크와 부하 테스트를 실행합니다.
+
+    python -m benchmarks.run --sizes 1000,10000 --output bench.json
+    python -m benchmarks.run --sizes 1000,10000 --baseline bench.json   # 기준보다 느려지면 종료 코드 1
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# 기준값과 비교하는 지표
+COMPARED_METRICS = ('p50_ms', 'p95_ms')
+
+
+def _prepare_environment(workdir):
+    """app 모듈을 불러오기 전에 임시 DB와 스냅샷 위치를 지정합니다."""
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['CATALOG_SNAPSHOT_DIR'] = os.path.join(workdir, 'catalog')
+    os.environ.pop('RECOMMEND_CACHE_URL', None)
+
+
+def run(workdir, sizes, users, repeat, load_seconds, concurrency, seed):
+    from benchmarks.load import _AppClient, run_load
+    from benchmarks.micro import run_micro
+    from benchmarks.synthetic import seed_database
+    from app import app
+    from models import db
+
+    results = {}
+    for size in sizes:
+        print(f"[{size}] seeding {size} pokemon, {users} users...", file=sys.stderr)
+        csv_path = os.path.join(workdir, f'catalog_{size}.csv')
+        started = time.perf_counter()
+        with app.app_context():
+            likes = seed_database(db, csv_path, size, users, seed)
+        print(f"[{size}] seeded in {time.perf_counter() - started:.1f}s, running micro benchmarks...", file=sys.stderr)
+
+        size_results = run_micro(app, likes, csv_path, repeat=repeat, seed=seed)
+        if load_seconds:
+            print(f"[{size}] load test: {concurrency} threads x {load_seconds}s...", file=sys.stderr)
+            size_results['load_mixed'] = run_load(lambda: _AppClient(app), concurrency=concurrency,
+                                                  duration=load_seconds, seed=seed)
+        results[str(size)] = size_results
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """기준값보다 tolerance 비율 이상 느려진 항목을 (크기, 이름, 지표, 기준값, 현재값) 목록으로 반환합니다."""
+    regressions = []
+    for size, benchmarks in results.items():
+        for name, stats in benchmarks.items():
+            base = baseline.get('results', {}).get(size, {}).get(name)
+            if not base:
+                continue
+            for metric in COMPARED_METRICS:
+                if metric in stats and base.get(metric) and stats[metric] > base[metric] * (1 + tolerance):
+                    regressions.append((size, name, metric, base[metric], stats[metric]))
+    return regressions
+
+
+def print_table(results):
+    for size, benchmarks in results.items():
+        print(f"\n== {size} pokemon ==")
+        print(f"{'benchmark':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}")
+        for name, stats in benchmarks.items():
+            print(f"{name:<32}{stats.get('p50_ms', 0):>10.2f}{stats.get('p95_ms', 0):>10.2f}"
+                  f"{stats.get('p99_ms', 0):>10.2f}{stats.get('ops_per_sec') or 0:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 카탈로그로 API 주요 경로의 성능을 측정합니다.")
+    parser.add_argument('--sizes', default='1000,10000', help="카탈로그 크기 목록 (예: 1000,10000,100000)")
+    parser.add_argument('--users', type=int, default=200, help="합성 사용자 수")
+    parser.add_argument('--repeat', type=int, default=50, help="벤치마크별 반복 횟수")
+    parser.add_argument('--load-seconds', type=float, default=5.0, help="부하 테스트 시간 (0이면 생략)")
+    parser.add_argument('--concurrency', type=int, default=8, help="부하 테스트 동시 요청 수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON 파일")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="허용하는 성능 저하 비율 (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='pokedex-bench-') as workdir:
+        _prepare_environment(workdir)
+        results = run(workdir, [int(size) for size in args.sizes.split(',')], args.users, args.repeat,
+                      args.load_seconds, args.concurrency, args.seed)
+
+    print_table(results)
+    report = {
+        'meta': {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(),
+                 'platform': platform.platform(), 'users': args.users, 'repeat': args.repeat, 'seed': args.seed},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nResults saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nPERFORMANCE REGRESSION (tolerance {args.tolerance:.0%}):")
+            for size, name, metric, base, current in regressions:
+                print(f"  [{size}] {name} {metric}: {base:.2f} -> {current:.2f} ({current / base - 1:+.0%})")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}.")
+
+
+if __name__ == '__main__':
+    main()
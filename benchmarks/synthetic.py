@@ -0,0 +1,108 @@
+import csv
+import random
+from sqlalchemy import insert
+
+# 실제 도감과 비슷한 빈도의 태그 (이름, 가중치)
+TYPES = [('물', 13), ('노말', 11), ('풀', 9), ('비행', 9), ('에스퍼', 7), ('벌레', 7), ('독', 6), ('땅', 6),
+         ('불꽃', 6), ('바위', 6), ('격투', 5), ('전기', 5), ('강철', 5), ('고스트', 4), ('드래곤', 4),
+         ('악', 4), ('얼음', 4), ('페어리', 4)]
+ROLES = [('물리 공격형', 8), ('특수 공격형', 7), ('방어형', 5), ('지원형', 4), ('스피드형', 4), ('만능형', 2)]
+FEATURES = [('귀여움', 8), ('멋짐', 8), ('초보자 추천', 5), ('강력함', 5), ('희귀함', 3), ('인기', 4),
+            ('진화 필요', 6), ('수집 가치', 2), ('밤에 활동', 2), ('물가 서식', 3), ('숲 서식', 3), ('도시 서식', 2)]
+APPEARANCES = [('동물형', 10), ('인간형', 4), ('용형', 3), ('새형', 6), ('곤충형', 6), ('물고기형', 4),
+               ('식물형', 4), ('광물형', 3), ('유령형', 2), ('빨간색', 5), ('파란색', 6), ('초록색', 5),
+               ('노란색', 4), ('검은색', 3), ('흰색', 3)]
+SYLLABLES = '가나다라마바사아자차카타파하피카츄리몽꼬부기이상해씨파이드뮤잠만보갸라도스'
+
+CSV_HEADER = ['pokemon_id', 'national_id', 'evolution_chain_id', 'name', 'generation', 'is_legendary',
+              'is_mythical', 'type', 'role', 'feature', 'appearance']
+
+
+def _pick(rng, weighted, low, high):
+    """가중치에 따라 서로 다른 태그를 low~high개 골라 ', '로 잇습니다."""
+    names = [name for name, _ in weighted]
+    weights = [weight for _, weight in weighted]
+    count = rng.randint(low, high)
+    chosen = []
+    while len(chosen) < count:
+        name = rng.choices(names, weights)[0]
+        if name not in chosen:
+            chosen.append(name)
+    return ', '.join(chosen)
+
+
+def generate_catalog(size, seed=0):
+    """CSV 행(딕셔너리) 목록으로 합성 포켓몬 카탈로그를 만듭니다. 진화 체인은 1~3마리씩 묶입니다."""
+    rng = random.Random(seed)
+    rows = []
+    chain_id, chain_left = 0, 0
+    for pokemon_id in range(1, size + 1):
+        if chain_left == 0:
+            chain_id += 1
+            chain_left = rng.choices([1, 2, 3], [30, 35, 35])[0]
+        chain_left -= 1
+        legendary = rng.random() < 0.02
+        name = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+        rows.append({
+            'pokemon_id': pokemon_id,
+            'national_id': pokemon_id,
+            'evolution_chain_id': chain_id,
+            'name': f"{name}{pokemon_id}",
+            'generation': str(1 + (pokemon_id - 1) * 9 // size),
+            'is_legendary': str(legendary),
+            'is_mythical': str(not legendary and rng.random() < 0.01),
+            'type': _pick(rng, TYPES, 1, 2),
+            'role': _pick(rng, ROLES, 1, 2),
+            'feature': _pick(rng, FEATURES, 1, 3) + (', 전설' if legendary else ''),
+            'appearance': _pick(rng, APPEARANCES, 1, 2),
+        })
+    return rows
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def generate_likes(user_count, pokemon_count, seed=0, max_likes=300):
+    """사용자별 '좋아요' 목록을 만듭니다. 대부분은 적고 일부는 많으며(파레토 분포), 인기 포켓몬일수록 자주 선택됩니다."""
+    rng = random.Random(seed)
+    popularity = [1 / (rank ** 0.8) for rank in range(1, pokemon_count + 1)]
+    ids = list(range(1, pokemon_count + 1))
+    rng.shuffle(ids)
+    likes = {}
+    for user_id in range(1, user_count + 1):
+        count = min(int(rng.paretovariate(1.1)) * 2 - 2, max_likes, pokemon_count)
+        likes[user_id] = sorted(set(rng.choices(ids, popularity, k=count)))
+    return likes
+
+
+def seed_database(db, csv_path, size, user_count, seed=0):
+    """빈 DB에 합성 카탈로그를 임포트하고 사용자와 '좋아요'를 채웁니다. 사용자별 '좋아요' 목록을 반환합니다."""
+    from catalog import bump_catalog_version
+    from importer import import_pokemon
+    from models import User, UserLike
+    from passwords import password_hasher
+    from profiles import rebuild_user_profiles
+
+    db.drop_all()
+    db.create_all()
+    write_csv(csv_path, generate_catalog(size, seed))
+    import_pokemon(csv_path, fetch_descriptions=False)
+
+    # bcrypt 해시는 느리므로 모든 사용자가 같은 비밀번호 해시를 사용합니다.
+    password_hash = password_hasher.hash('bench')
+    db.session.execute(insert(User), [{'id': user_id, 'username': f'bench{user_id}', 'password_hash': password_hash,
+                                       'is_admin': user_id == 1}
+                                      for user_id in range(1, user_count + 1)])
+    likes = generate_likes(user_count, size, seed)
+    rows = [{'user_id': user_id, 'pokemon_id': pokemon_id}
+            for user_id, pokemon_ids in likes.items() for pokemon_id in pokemon_ids]
+    if rows:
+        db.session.execute(insert(UserLike), rows)
+    rebuild_user_profiles()
+    db.session.commit()
+    bump_catalog_version()
+    return likes
@@ -0,0 +1,32 @@
+import time
+import numpy as np
+
+
+def summarize(samples, elapsed=None):
+    """측정값(초) 목록의 요약 통계를 밀리초 단위 딕셔너리로 반환합니다."""
+    samples = np.asarray(samples, dtype=float)
+    if not len(samples):
+        return {'count': 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    elapsed = samples.sum() if elapsed is None else elapsed
+    return {
+        'count': int(len(samples)),
+        'mean_ms': round(samples.mean() * 1000, 3),
+        'min_ms': round(samples.min() * 1000, 3),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'ops_per_sec': round(len(samples) / elapsed, 1) if elapsed else None,
+    }
+
+
+def measure(fn, repeat=50, warmup=5):
+    """fn()을 warmup번 실행한 뒤 repeat번 실행 시간을 재어 요약 통계를 반환합니다."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
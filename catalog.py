@@ -0,0 +1,70 @@
+import threading
+import time
+import uuid
+from flask import current_app
+from models import db, CatalogState
+from profiles import upsert
+
+# 다른 워커 프로세스의 변경을 확인하기 위해 DB의 세대 번호를 다시 읽는 최소 간격 (초)
+DEFAULT_CHECK_INTERVAL = 1.0
+
+# 이 프로세스가 마지막으로 확인한 카탈로그 상태
+_state = {'token': None, 'generation': 0, 'checked_at': None}
+_state_lock = threading.Lock()
+
+
+def _refresh(force=False):
+    interval = current_app.config.get('CATALOG_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+    now = time.monotonic()
+    if not force and _state['checked_at'] is not None and now - _state['checked_at'] < interval:
+        return
+    row = db.session.query(CatalogState.token, CatalogState.generation).filter_by(id=1).first()
+    with _state_lock:
+        _state['token'], _state['generation'] = row if row else (None, 0)
+        _state['checked_at'] = now
+
+
+def catalog_generation():
+    """현재 카탈로그 세대 번호를 반환합니다. (최대 CATALOG_CHECK_INTERVAL초 전의 값)"""
+    _refresh()
+    return _state['generation']
+
+
+def catalog_version():
+    """캐시 키로 쓰는 카탈로그 버전 문자열 ('토큰-세대')을 반환합니다."""
+    _refresh()
+    token, generation = _state['token'], _state['generation']
+    return f"{token}-{generation}" if token else str(generation)
+
+
+def bump_catalog_version():
+    """포켓몬 데이터가 바뀌었음을 DB에 기록합니다. 모든 워커의 카탈로그 기반 캐시가 다음 사용 시 다시 만들어집니다.
+
+    포켓몬 데이터 변경을 commit한 뒤에 호출하세요. 세대 번호 증가는 이 함수가 commit합니다.
+    """
+    stmt = upsert(CatalogState).values(id=1, generation=1, token=uuid.uuid4().hex)
+    stmt = stmt.on_conflict_do_update(index_elements=['id'], set_={'generation': CatalogState.generation + 1})
+    db.session.execute(stmt)
+    db.session.commit()
+    _refresh(force=True)
+    return catalog_version()
+
+
+class CatalogCache:
+    """카탈로그 버전이 바뀌면 build()로 다시 만드는 프로세스 단위 캐시"""
+
+    def __init__(self, build):
+        self.build = build
+        self._value = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """현재 카탈로그 버전에 해당하는 값을 반환합니다."""
+        version = catalog_version()
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    self._value = self.build()
+                    self._version = version
+        return self._value
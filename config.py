@@ -0,0 +1,56 @@
+import os
+import sqlite3
+from sqlalchemy import event
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def database_uri():
+    """DATABASE_URL 환경 변수의 DB 주소를 반환합니다. 없으면 로컬 SQLite 파일을 사용합니다."""
+    uri = os.environ.get('DATABASE_URL', 'sqlite:///pokemon_app.db')
+    # 'postgres://' 형식(일부 호스팅 서비스)은 SQLAlchemy가 인식하는 이름으로 바꿉니다.
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def engine_options(uri):
+    """DB 종류에 맞는 SQLAlchemy 엔진 옵션(커넥션 풀 크기 등)을 만듭니다."""
+    if uri.startswith('sqlite') and (uri == 'sqlite://' or ':memory:' in uri or 'mode=memory' in uri):
+        return {} # 메모리 DB는 SQLAlchemy 기본 풀을 사용합니다.
+    options = {
+        'pool_size': _env_int('DB_POOL_SIZE', 5),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+        'pool_pre_ping': True,
+    }
+    if not uri.startswith('sqlite'):
+        options['pool_recycle'] = _env_int('DB_POOL_RECYCLE', 1800)
+    return options
+
+
+def sqlite_pragmas():
+    """SQLite 연결마다 적용할 PRAGMA 설정"""
+    return {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'), # 읽기와 쓰기가 서로 막지 않도록
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': _env_int('SQLITE_BUSY_TIMEOUT', 5000), # ms, 'database is locked' 대신 잠시 기다립니다.
+        'mmap_size': _env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+    }
+
+
+def configure_engine(engine, pragmas):
+    """SQLite 엔진이면 새 연결마다 PRAGMA를 적용하도록 등록합니다."""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
@@ -1,79 +1,180 @@
-import pandas as pd
-import requests
+import argparse
+import io
+import json
+import os
 import time
-import re
-from tqdm import tqdm
+import pandas as pd
+from fileutil import atomic_write
+from pokeapi import POKEMON_API_URL, SpeciesFetcher, evolution_chain_id, korean_flavor_text, sprite_url
 
 # 상수 정의
 CSV_FILE = 'pokemon_completed.csv'
-SPECIES_API_URL = 'https://pokeapi.co/api/v2/pokemon-species/{id}'
+CHUNK_SIZE = 200
+
+# 보강할 수 있는 컬럼: 컬럼 이름 -> (필요한 PokeAPI 자원, 응답에서 값을 꺼내는 함수)
+ENRICHERS = {
+    'evolution_chain_id': ('species', evolution_chain_id),
+    'description': ('species', korean_flavor_text),
+    'sprite_url': ('pokemon', sprite_url),
+}
+
 
-def get_evolution_chain_id(url):
-    """Evolution chain URL에서 ID를 추출합니다."""
-    if not url or not isinstance(url, str):
-        return None
-    match = re.search(r'/(\d+)/$', url)
-    return int(match.group(1)) if match else None
+def checkpoint_path(csv_file):
+    return f'{csv_file}.checkpoint.json'
 
-def enrich_pokemon_data():
-    """CSV 파일을 읽고, PokeAPI를 호출하여 evolution_chain_id를 추가합니다."""
+
+def _load_checkpoint(path):
     try:
-        df = pd.read_csv(CSV_FILE)
-    except FileNotFoundError:
-        print(f"오류: '{CSV_FILE}' 파일을 찾을 수 없습니다.")
-        return
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_checkpoint(path, checkpoint):
+    """체크포인트를 원자적으로 저장합니다."""
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+
+
+def _source_signature(csv_file):
+    stat = os.stat(csv_file)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _output_columns(columns, fields):
+    """보강 컬럼이 없으면 추가한 출력 컬럼 순서 (evolution_chain_id는 name 앞에)"""
+    columns = list(columns)
+    for field in fields:
+        if field in columns:
+            continue
+        if field == 'evolution_chain_id' and 'name' in columns:
+            columns.insert(columns.index('name'), field)
+        else:
+            columns.append(field)
+    return columns
+
+
+def enrich_chunk(chunk, fields, fetchers, enriched_at, max_age=None, now=None):
+    """chunk에서 비어 있거나 오래된 행만 PokeAPI로 채웁니다. 채운 행 수를 반환합니다.
+
+    enriched_at({national_id: 보강 시각})에 성공한 행의 시각을 기록합니다.
+    """
+    now = now or time.time()
+    national_ids = pd.to_numeric(chunk['national_id'], errors='coerce')
+    valid = national_ids.notna()
+    keys = national_ids.fillna(0).astype(int).astype(str)
 
-    if 'evolution_chain_id' in df.columns:
-        print("이미 'evolution_chain_id' 컬럼이 존재합니다. 스크립트를 종료합니다.")
+    missing = pd.Series(False, index=chunk.index)
+    for field in fields:
+        missing |= chunk[field] == ''
+    if max_age is not None:
+        missing |= keys.map(lambda key: now - enriched_at.get(key, 0) > max_age)
+    todo = chunk.index[valid & missing]
+    if not len(todo):
+        return 0
+
+    ids = national_ids[todo].astype(int).tolist()
+    responses = {resource: fetchers[resource].fetch_many(ids)
+                 for resource in {ENRICHERS[field][0] for field in fields}}
+
+    filled = 0
+    for position, national_id in zip(todo, ids):
+        results = {resource: responses[resource].get(national_id) for resource in responses}
+        if any(data is None for data in results.values()):
+            continue # 실패한 행은 비워 두고 다음 실행에서 다시 시도합니다.
+        for field in fields:
+            resource, extract = ENRICHERS[field]
+            value = extract(results[resource])
+            chunk.at[position, field] = '' if value is None else str(value)
+        enriched_at[keys[position]] = now
+        filled += 1
+    return filled
+
+
+def enrich_pokemon_data(fetcher=None, csv_file=CSV_FILE, fields=tuple(ENRICHERS), chunk_size=CHUNK_SIZE,
+                        max_age_days=None, pokemon_fetcher=None, restart=False):
+    """CSV를 chunk_size행씩 읽어 PokeAPI 정보(진화 체인 ID, 한국어 설명, 스프라이트 URL)로 보강합니다.
+
+    비어 있는 값(max_age_days를 주면 그보다 오래 전에 보강한 행도)만 가져오며, 결과는 임시 파일에 이어 쓰고
+    묶음마다 진행 상황을 '<CSV>.checkpoint.json'에 기록합니다. 중단되면 다음 실행에서 이어서 처리하고,
+    끝나면 임시 파일의 이름을 바꿔 원본 CSV를 한 번에 교체합니다.
+    """
+    if not os.path.exists(csv_file):
+        print(f"오류: '{csv_file}' 파일을 찾을 수 없습니다.")
         return
 
-    if 'national_id' not in df.columns:
+    header = pd.read_csv(csv_file, nrows=0, encoding='utf-8-sig').columns
+    if 'national_id' not in header:
         print("오류: 'national_id' 컬럼이 필요합니다.")
         return
+    fields = [field for field in fields if field in ENRICHERS]
+    columns = _output_columns(header, fields)
 
-    evolution_chain_ids = []
-    
-    print(f"총 {len(df)}개의 포켓몬 데이터 보강을 시작합니다...")
-
-    # tqdm을 사용하여 진행률 표시
-    for index, row in tqdm(df.iterrows(), total=df.shape[0], desc="진화 정보 가져오는 중"):
-        national_id = row['national_id']
-        
-        # national_id가 유효한 숫자인지 확인
-        if pd.isna(national_id) or not str(national_id).isdigit():
-            evolution_chain_ids.append(None)
-            continue
+    fetchers = {
+        'species': fetcher or SpeciesFetcher(),
+        'pokemon': pokemon_fetcher or SpeciesFetcher(base_url=POKEMON_API_URL, resource='pokemon'),
+    }
+    max_age = max_age_days * 86400 if max_age_days is not None else None
+
+    state_path = checkpoint_path(csv_file)
+    temp_path = f'{csv_file}.partial'
+    checkpoint = _load_checkpoint(state_path)
+    enriched_at = checkpoint.get('enriched_at', {})
+    run = checkpoint.get('run')
+    signature = _source_signature(csv_file)
+    if restart or not run or run.get('source') != signature or run.get('fields') != fields \
+            or not os.path.exists(temp_path):
+        run = {'source': signature, 'fields': fields, 'rows_done': 0, 'bytes_written': 0, 'filled': 0}
+    elif run['rows_done']:
+        print(f"이전 실행을 이어서 진행합니다. (처리된 행: {run['rows_done']})")
+
+    with open(temp_path, 'ab') as output:
+        # 마지막 체크포인트 이후에 쓰다 만 부분은 잘라냅니다.
+        output.truncate(run['bytes_written'])
+        output.seek(run['bytes_written'])
+        if run['bytes_written'] == 0:
+            output.write(pd.DataFrame(columns=columns).to_csv(index=False).encode('utf-8-sig'))
+
+        reader = pd.read_csv(csv_file, dtype=str, keep_default_na=False, encoding='utf-8-sig', chunksize=chunk_size)
+        skip = run['rows_done']
+        for chunk in reader:
+            if skip >= len(chunk): # 이미 임시 파일에 쓴 행들
+                skip -= len(chunk)
+                continue
+            chunk = chunk.iloc[skip:].reindex(columns=columns, fill_value='')
+            skip = 0
+            run['filled'] += enrich_chunk(chunk, fields, fetchers, enriched_at, max_age)
+
+            buffer = io.StringIO()
+            chunk.to_csv(buffer, index=False, header=False)
+            output.write(buffer.getvalue().encode('utf-8'))
+            output.flush()
+            os.fsync(output.fileno())
+
+            run['rows_done'] += len(chunk)
+            run['bytes_written'] = output.tell()
+            _save_checkpoint(state_path, {'enriched_at': enriched_at, 'run': run})
+            print(f"  {run['rows_done']}행 처리 (보강 {run['filled']}행)")
+
+    os.replace(temp_path, csv_file)
+    _save_checkpoint(state_path, {'enriched_at': enriched_at})
 
-        try:
-            response = requests.get(SPECIES_API_URL.format(id=int(national_id)))
-            
-            if response.status_code == 200:
-                data = response.json()
-                chain_url = data.get('evolution_chain', {}).get('url')
-                chain_id = get_evolution_chain_id(chain_url)
-                evolution_chain_ids.append(chain_id)
-            else:
-                evolution_chain_ids.append(None)
-                print(f"경고: National ID {national_id}에 대한 정보를 가져오지 못했습니다. (상태 코드: {response.status_code})")
-
-        except requests.RequestException as e:
-            evolution_chain_ids.append(None)
-            print(f"오류: National ID {national_id} 요청 중 네트워크 오류 발생: {e}")
-            # 네트워크 오류 시 잠시 대기 후 재시도하거나 중단할 수 있음
-            break
-        
-        # API 서버에 부담을 주지 않기 위해 약간의 딜레이 추가
-        time.sleep(0.05)
-
-    # 새 컬럼 추가
-    # national_id와 name 컬럼 사이에 evolution_chain_id 컬럼을 삽입
-    df.insert(df.columns.get_loc('name'), 'evolution_chain_id', evolution_chain_ids)
-    
-    # 업데이트된 DataFrame을 CSV 파일로 저장
-    df.to_csv(CSV_FILE, index=False, encoding='utf-8-sig')
-    
     print("\n데이터 보강이 완료되었습니다!")
-    print(f"'{CSV_FILE}' 파일이 'evolution_chain_id' 컬럼과 함께 업데이트되었습니다.")
+    print(f"'{csv_file}' 파일의 {', '.join(fields)} 컬럼이 업데이트되었습니다. (보강 {run['filled']}행)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PokeAPI 정보로 포켓몬 CSV를 보강합니다. (중단 후 이어서 실행 가능)")
+    parser.add_argument('--csv', default=CSV_FILE, help="보강할 CSV 파일")
+    parser.add_argument('--fields', default=','.join(ENRICHERS), help="보강할 컬럼 (쉼표로 구분)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="한 번에 처리하고 저장하는 행 수")
+    parser.add_argument('--max-age-days', type=float, help="이 기간보다 오래 전에 보강한 행도 다시 가져옵니다.")
+    parser.add_argument('--restart', action='store_true', help="이전 진행 상황을 무시하고 처음부터 실행합니다.")
+    args = parser.parse_args()
+    enrich_pokemon_data(csv_file=args.csv, fields=[field.strip() for field in args.fields.split(',')],
+                        chunk_size=args.chunk_size, max_age_days=args.max_age_days, restart=args.restart)
+
 
 if __name__ == '__main__':
-    enrich_pokemon_data()
+    main()
@@ -0,0 +1,51 @@
+from catalog import CatalogCache
+from snapshot import get_catalog_snapshot
+
+
+class EvolutionGroups:
+    """진화 그룹 색인: evolution_chain_id별 멤버 목록을 그룹의 최소 pokemon_id 순으로 보관합니다.
+
+    진화 체인이 없는 포켓몬은 혼자서 하나의 그룹이 됩니다.
+    """
+
+    def __init__(self, rows):
+        # rows: (pokemon_id, evolution_chain_id) 튜플 목록
+        members_by_key = {}
+        for pokemon_id, chain_id in rows:
+            key = chain_id if chain_id else f"ind_{pokemon_id}"
+            members_by_key.setdefault(key, []).append(pokemon_id)
+
+        self.groups = sorted((sorted(members) for members in members_by_key.values()), key=lambda members: members[0])
+        self.group_of = {pokemon_id: position
+                         for position, members in enumerate(self.groups)
+                         for pokemon_id in members}
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """카탈로그 스냅샷의 pokemon_id와 evolution_chain_id 컬럼으로 색인을 만듭니다."""
+        return cls(zip(snapshot.column('pokemon_id'), snapshot.column('evolution_chain_id')))
+
+    def matching_groups(self, matched_ids=None):
+        """매칭된 포켓몬이 하나라도 속한 그룹 위치를 최소 pokemon_id 순으로 반환합니다. None이면 전체 그룹."""
+        if matched_ids is None:
+            return range(len(self.groups))
+        return sorted({self.group_of[pokemon_id] for pokemon_id in matched_ids if pokemon_id in self.group_of})
+
+    def page(self, matched_ids, page, per_page):
+        """한 페이지에 해당하는 그룹들의 멤버 목록과 전체 그룹 수를 반환합니다."""
+        positions = self.matching_groups(matched_ids)
+        start = (page - 1) * per_page
+        return [self.groups[position] for position in positions[start:start + per_page]], len(positions)
+
+    def groups_for(self, pokemon_ids):
+        """주어진 포켓몬들이 속한 그룹의 멤버 목록을 (중복 없이) 반환합니다."""
+        positions = dict.fromkeys(self.group_of[pokemon_id] for pokemon_id in pokemon_ids if pokemon_id in self.group_of)
+        return [self.groups[position] for position in positions]
+
+
+_groups = CatalogCache(lambda: EvolutionGroups.from_snapshot(get_catalog_snapshot()))
+
+
+def get_evolution_groups():
+    """현재 카탈로그 버전의 진화 그룹 색인을 반환합니다."""
+    return _groups.get()
@@ -0,0 +1,29 @@
+import os
+import threading
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path, mode='wb', encoding=None):
+    """path에 쓸 임시 파일을 열어 주고, 다 쓰면 이름을 바꿔 원자적으로 교체합니다.
+
+    읽는 쪽은 항상 이전 파일이나 완성된 새 파일만 봅니다. 쓰는 도중 오류가 나면 임시 파일을 지우고 기존 파일은 그대로 둡니다.
+    임시 파일 이름에 프로세스/스레드 id를 붙이므로 여러 워커가 같은 파일을 동시에 써도 서로 덮어쓰지 않습니다.
+
+        with atomic_write(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f'{path}.tmp-{os.getpid()}-{threading.get_ident()}'
+    try:
+        with open(temp_path, mode, encoding=encoding) as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,160 @@
+import time
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert, update
+from models import db, chunked, Pokemon
+from pokeapi import SpeciesFetcher, korean_flavor_text
+from profiles import rebuild_profiles_for_pokemon, rebuild_user_profiles
+from sprites import LOCAL_SPRITE_PREFIX
+from tag_index import sync_pokemon_tags
+
+SPRITE_BASE_URL = 'https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/'
+
+# CSV에서 그대로 가져와 비교(upsert)하는 컬럼들. description은 새 포켓몬에만 채웁니다.
+COMPARED_COLUMNS = ['name_ko', 'name_en', 'generation', 'is_legendary', 'is_mythical', 'evolution_chain_id',
+                    'type', 'role', 'feature', 'appearance', 'national_id', 'image_url']
+
+
+class ImportReport:
+    """임포트 단계별 소요 시간과 처리 건수"""
+
+    def __init__(self):
+        self.timings = {}
+        self.total_rows = 0
+        self.inserted = 0
+        self.updated = 0
+
+    def stage(self, name):
+        """with 블록의 소요 시간을 name 단계로 기록합니다."""
+        return _Stage(self, name)
+
+    @property
+    def elapsed(self):
+        return sum(self.timings.values())
+
+    def summary(self):
+        lines = [f"  {name:<14}{seconds:8.3f}s" for name, seconds in self.timings.items()]
+        rows_per_sec = self.total_rows / self.elapsed if self.elapsed else 0.0
+        lines.append(f"{self.total_rows} pokemon records processed "
+                     f"({self.inserted} inserted, {self.updated} updated) "
+                     f"in {self.elapsed:.3f}s, {rows_per_sec:.0f} rows/sec.")
+        return '\n'.join(lines)
+
+
+class _Stage:
+    def __init__(self, report, name):
+        self.report = report
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.report.timings[self.name] = time.perf_counter() - self.started
+
+
+def read_pokemon_csv(path):
+    """CSV 파일을 읽어 DB 컬럼 형태의 DataFrame으로 변환합니다."""
+    df = pd.read_csv(path, dtype=str).fillna('')
+    df['pokemon_id'] = pd.to_numeric(df['pokemon_id'], errors='coerce')
+    df.dropna(subset=['pokemon_id'], inplace=True)
+    df['pokemon_id'] = df['pokemon_id'].astype(int)
+    df.drop_duplicates(subset=['pokemon_id'], keep='first', inplace=True)
+    national_id = pd.to_numeric(df['national_id'], errors='coerce').fillna(0).astype(int)
+    evolution_chain_id = pd.to_numeric(df['evolution_chain_id'], errors='coerce').fillna(0).astype(int)
+    image_url = pd.Series(np.where(national_id != 0, SPRITE_BASE_URL + national_id.astype(str) + '.png', ''), index=df.index)
+    if 'sprite_url' in df.columns: # enrich_data.py가 채운 스프라이트 URL이 있으면 우선 사용합니다.
+        image_url = df['sprite_url'].where(df['sprite_url'] != '', image_url)
+
+    records = pd.DataFrame({
+        'pokemon_id': df['pokemon_id'],
+        'name_ko': df['name'],
+        'name_en': df['name'],
+        'generation': df.get('generation', ''),
+        'is_legendary': df.get('is_legendary', ''),
+        'is_mythical': df.get('is_mythical', ''),
+        'evolution_chain_id': evolution_chain_id.astype(object).where(evolution_chain_id != 0, None),
+        'type': df['type'],
+        'role': df['role'],
+        'feature': df['feature'],
+        'appearance': df['appearance'],
+        'national_id': national_id.astype(object).where(national_id != 0, None),
+        'image_url': image_url,
+        'description': df.get('description', ''),
+    })
+    return records.reset_index(drop=True)
+
+
+def _to_mappings(df):
+    """DataFrame을 executemany용 딕셔너리 목록으로 변환합니다. (NaN은 None으로)"""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict('records')
+
+
+def import_pokemon(path, chunk_size=500, upsert=False, fetch_descriptions=True, fetcher=None):
+    """CSV의 포켓몬 데이터를 일괄로 가져옵니다. (commit 포함)
+
+    기존 pokemon_id를 한 번에 조회해 DataFrame과 비교한 뒤, 새 포켓몬은 chunk_size 단위
+    executemany로 추가하고 upsert=True면 값이 바뀐 기존 포켓몬도 일괄 수정합니다.
+    """
+    report = ImportReport()
+
+    with report.stage('read'):
+        records = read_pokemon_csv(path)
+        report.total_rows = len(records)
+
+    with report.stage('diff'):
+        existing = pd.DataFrame(
+            db.session.query(Pokemon.id, Pokemon.pokemon_id, *[getattr(Pokemon, col) for col in COMPARED_COLUMNS]).all(),
+            columns=['id', 'pokemon_id'] + COMPARED_COLUMNS,
+        )
+        is_new = ~records['pokemon_id'].isin(existing['pokemon_id'])
+        new_records = records[is_new].copy()
+
+        updated_columns = ['id', 'pokemon_id'] + COMPARED_COLUMNS
+        changed = pd.DataFrame(columns=updated_columns)
+        if upsert and not existing.empty:
+            merged = records[~is_new].merge(existing, on='pokemon_id', suffixes=('', '_old'))
+            # mirror-sprites로 로컬 주소로 바꾼 이미지 URL은 그대로 둡니다.
+            local_sprite = merged['image_url_old'].fillna('').str.startswith(LOCAL_SPRITE_PREFIX)
+            merged.loc[local_sprite, 'image_url'] = merged.loc[local_sprite, 'image_url_old']
+            differs = np.zeros(len(merged), dtype=bool)
+            for col in COMPARED_COLUMNS:
+                new_values, old_values = merged[col], merged[f'{col}_old']
+                differs |= ~((new_values == old_values) | (new_values.isna() & old_values.isna())).to_numpy()
+            changed = merged.loc[differs, updated_columns]
+
+    # CSV에 설명이 없는 새 포켓몬만 PokeAPI에서 가져옵니다.
+    missing = (new_records['description'] == '') & new_records['national_id'].notna()
+    if fetch_descriptions and missing.any():
+        with report.stage('descriptions'):
+            fetcher = fetcher or SpeciesFetcher()
+            species = fetcher.fetch_many(new_records.loc[missing, 'national_id'])
+            new_records.loc[missing, 'description'] = [
+                korean_flavor_text(species.get(national_id)) for national_id in new_records.loc[missing, 'national_id']
+            ]
+
+    with report.stage('insert'):
+        for chunk in chunked(_to_mappings(new_records), chunk_size):
+            db.session.execute(insert(Pokemon), chunk)
+        report.inserted = len(new_records)
+
+    with report.stage('update'):
+        for chunk in chunked(_to_mappings(changed), chunk_size):
+            db.session.execute(update(Pokemon), chunk)
+        report.updated = len(changed)
+
+    with report.stage('tags'):
+        touched_ids = new_records['pokemon_id'].tolist() + changed['pokemon_id'].tolist()
+        if touched_ids and len(touched_ids) == len(existing) + len(new_records):
+            # 카탈로그 전체가 바뀌었으면(처음 임포트 등) id 목록 없이 한 번에 다시 채웁니다.
+            sync_pokemon_tags()
+            rebuild_user_profiles()
+        elif touched_ids:
+            sync_pokemon_tags(touched_ids)
+            rebuild_profiles_for_pokemon(touched_ids)
+
+    with report.stage('commit'):
+        db.session.commit()
+
+    return report
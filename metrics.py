@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# 요청 처리 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 요청당 SQL 쿼리 수 히스토그램 구간
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+        self.total += 1
+        self.sum += value
+
+
+class EndpointStats:
+    """엔드포인트 하나의 누적 통계"""
+
+    def __init__(self):
+        self.responses = Counter() # (method, status) -> 요청 수
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.query_seconds = 0.0
+        self.rows_loaded = 0
+        self.response_bytes = 0
+        self.n_plus_one = 0
+
+
+class _CountingIterable:
+    """스트리밍 응답의 본문을 그대로 내보내면서 실제로 보낸 바이트 수를 세고, 끝나면(close) on_close에 넘깁니다."""
+
+    def __init__(self, iterable, on_close):
+        self.iterable = iterable
+        self.on_close = on_close
+        self.sent = 0
+
+    def __iter__(self):
+        for chunk in self.iterable:
+            self.sent += len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            yield chunk
+
+    def close(self):
+        try:
+            if hasattr(self.iterable, 'close'):
+                self.iterable.close()
+        finally:
+            self.on_close(self.sent)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class Metrics:
+    """요청별 처리 시간, SQL 쿼리 수/시간, ORM 객체 로드 수, 응답 크기를 엔드포인트별로 집계합니다.
+
+    값은 워커 프로세스마다 따로 집계됩니다. 디버그 모드(또는 METRICS_DETECT_N_PLUS_ONE)에서는 한 요청 안에서
+    같은 SQL이 METRICS_N_PLUS_ONE_THRESHOLD번 이상 반복되면 N+1 의심으로 로그를 남깁니다.
+    """
+
+    def __init__(self, app=None):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        if not self._listening:
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            event.listen(Session, 'loaded_as_persistent', self._loaded_as_persistent)
+            self._listening = True
+        app.extensions['metrics'] = self
+
+    # --- 요청 훅 ---
+    def _before_request(self):
+        g.metrics = {'started_at': time.perf_counter(), 'queries': 0, 'query_seconds': 0.0, 'rows_loaded': 0,
+                     'statements': Counter() if self._detect_n_plus_one() else None}
+
+    def _after_request(self, response):
+        state = g.pop('metrics', None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state['started_at']
+        endpoint = request.endpoint or '<unmatched>'
+        repeated = []
+        if state['statements'] is not None:
+            threshold = current_app.config.get('METRICS_N_PLUS_ONE_THRESHOLD', 5)
+            repeated = [(statement, count) for statement, count in state['statements'].items() if count >= threshold]
+            for statement, count in repeated:
+                current_app.logger.warning("N+1 의심: %s에서 같은 쿼리가 %d번 실행되었습니다: %s",
+                                           endpoint, count, ' '.join(statement.split())[:200])
+
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.responses[(request.method, response.status_code)] += 1
+            stats.latency.observe(elapsed)
+            stats.queries.observe(state['queries'])
+            stats.query_seconds += state['query_seconds']
+            stats.rows_loaded += state['rows_loaded']
+            stats.n_plus_one += len(repeated)
+            if response.content_length is not None:
+                stats.response_bytes += response.content_length
+        if response.content_length is None and response.is_streamed:
+            # 길이를 미리 알 수 없는 스트리밍 응답(내보내기 등)은 실제로 보낸 바이트 수를 다 보낸 뒤에 더합니다.
+            response.response = _CountingIterable(response.response, lambda sent: self._add_response_bytes(endpoint, sent))
+        return response
+
+    def _add_response_bytes(self, endpoint, sent):
+        with self._lock:
+            self.endpoints[endpoint].response_bytes += sent
+
+    def _detect_n_plus_one(self):
+        return current_app.debug or current_app.config.get('METRICS_DETECT_N_PLUS_ONE', False)
+
+    # --- SQLAlchemy 이벤트 ---
+    # 시작 시각은 실행마다 새로 만들어지는 context에 둡니다. 실패한 쿼리는 after_cursor_execute가 불리지 않으므로
+    # 연결(conn.info)에 쌓아 두면 남은 값이 다음 쿼리의 시작 시각으로 잘못 짝지어집니다.
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None and has_request_context() and 'metrics' in g:
+            context._metrics_started_at = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, '_metrics_started_at', None)
+        if started_at is None or not (has_request_context() and 'metrics' in g):
+            return
+        state = g.metrics
+        state['queries'] += 1
+        state['query_seconds'] += time.perf_counter() - started_at
+        if state['statements'] is not None:
+            state['statements'][statement] += 1
+
+    def _loaded_as_persistent(self, session, instance):
+        if has_request_context() and 'metrics' in g:
+            g.metrics['rows_loaded'] += 1
+
+    # --- 출력 ---
+    def prometheus(self):
+        """집계 결과를 Prometheus 텍스트 형식으로 반환합니다."""
+        lines = []
+
+        def header(name, kind, text):
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, endpoint, histogram):
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f"{name}_bucket{_labels(endpoint=endpoint, le=bound)} {count}")
+            lines.append(f"{name}_bucket{_labels(endpoint=endpoint, le='+Inf')} {histogram.total}")
+            lines.append(f"{name}_sum{_labels(endpoint=endpoint)} {histogram.sum}")
+            lines.append(f"{name}_count{_labels(endpoint=endpoint)} {histogram.total}")
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+
+            header('pokedex_http_requests_total', 'counter', "Total HTTP requests.")
+            for endpoint, stats in endpoints:
+                for (method, status), count in sorted(stats.responses.items()):
+                    lines.append(f"pokedex_http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+            header('pokedex_http_request_duration_seconds', 'histogram', "Request latency in seconds.")
+            for endpoint, stats in endpoints:
+                histogram('pokedex_http_request_duration_seconds', endpoint, stats.latency)
+
+            header('pokedex_sql_queries_per_request', 'histogram', "SQL queries executed per request.")
+            for endpoint, stats in endpoints:
+                histogram('pokedex_sql_queries_per_request', endpoint, stats.queries)
+
+            for name, attribute, kind, text in (
+                    ('pokedex_sql_query_seconds_total', 'query_seconds', 'counter', "Time spent in SQL queries."),
+                    ('pokedex_orm_rows_loaded_total', 'rows_loaded', 'counter', "ORM objects hydrated from query results."),
+                    ('pokedex_http_response_bytes_total', 'response_bytes', 'counter', "Response body bytes sent."),
+                    ('pokedex_n_plus_one_warnings_total', 'n_plus_one', 'counter', "Repeated-statement (N+1) warnings in debug mode.")):
+                header(name, kind, text)
+                for endpoint, stats in endpoints:
+                    lines.append(f"{name}{_labels(endpoint=endpoint)} {getattr(stats, attribute)}")
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
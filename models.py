@@ -1,8 +1,21 @@
+import time
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
+from sqlalchemy import inspect, literal_column
+from sqlalchemy.schema import CreateColumn
+from passwords import password_hasher
 
 db = SQLAlchemy()
-bcrypt = Bcrypt()
+
+# 한 번의 IN (...)에 넣는 id 수 상한 (SQLite 32766개, PostgreSQL 65535개인 바인드 변수 제한보다 충분히 작게)
+MAX_IN_IDS = 5000
+
+
+def chunked(items, size=MAX_IN_IDS):
+    """목록을 size개씩 나눠 차례로 반환합니다."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class User(db.Model):
     """사용자 모델"""
@@ -10,14 +23,15 @@ class User(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
     is_admin = db.Column(db.Boolean, default=False, nullable=False)
+    token_version = db.Column(db.Integer, default=0, server_default='0', nullable=False) # 증가시키면 기존 토큰이 무효화됩니다.
 
     def set_password(self, password):
-        """비밀번호를 해시하여 저장"""
-        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        """비밀번호를 해시하여 저장 (프로세스 풀에서 계산, 바쁘면 PasswordHasherBusy)"""
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        """비밀번호 확인"""
-        return bcrypt.check_password_hash(self.password_hash, password)
+        """비밀번호 확인 (프로세스 풀에서 계산, 바쁘면 PasswordHasherBusy)"""
+        return password_hasher.check(self.password_hash, password)
 
 class UserLike(db.Model):
     """사용자가 '좋아요'한 포켓몬 모델"""
@@ -46,10 +60,74 @@ class Pokemon(db.Model):
     national_id = db.Column(db.Integer)
     image_url = db.Column(db.String)
     description = db.Column(db.Text) # 포켓몬 설명 필드 추가
+    # 행이 수정될 때마다(관리자 수정, 임포트 upsert 등) 자동으로 증가/갱신됩니다. ETag/Last-Modified에 사용합니다.
+    row_version = db.Column(db.Integer, default=1, server_default='1', nullable=False,
+                            onupdate=literal_column('row_version') + 1)
+    updated_at = db.Column(db.Integer, default=lambda: int(time.time()), server_default='0', nullable=False,
+                           onupdate=lambda: int(time.time())) # Unix 시각 (초), 0이면 알 수 없음
+
+    tags = db.relationship('PokemonTag', cascade='all, delete-orphan', lazy=True)
 
     def to_dict(self, score=None):
         """객체를 딕셔너리로 변환"""
-        data = {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        data = {name: getattr(self, name) for name in self.__table__.columns.keys()}
         if score is not None:
             data['score'] = score
         return data
+
+
+class Tag(db.Model):
+    """필터 태그 모델 (카테고리별 태그 이름)"""
+    id = db.Column(db.Integer, primary_key=True)
+    category = db.Column(db.String(20), nullable=False)
+    name = db.Column(db.String, nullable=False)
+
+    __table_args__ = (db.UniqueConstraint('category', 'name', name='_category_name_uc'),)
+
+class PokemonTag(db.Model):
+    """포켓몬-태그 연결 모델 (type/role/feature/appearance 컬럼을 정규화)"""
+    pokemon_id = db.Column(db.Integer, db.ForeignKey('pokemon.pokemon_id'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tag.id'), primary_key=True)
+    category = db.Column(db.String(20), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_pokemon_tag_category_tag_pokemon', 'category', 'tag_id', 'pokemon_id'),
+        db.Index('ix_pokemon_tag_tag_pokemon', 'tag_id', 'pokemon_id'),
+    )
+
+class UserProfile(db.Model):
+    """사용자별 '좋아요' 상태 버전 (좋아요/취소할 때마다 증가)"""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    likes_version = db.Column(db.Integer, default=0, nullable=False)
+
+class UserTagCount(db.Model):
+    """사용자가 '좋아요'한 포켓몬들의 태그별 개수 (개인화 추천 프로필)"""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tag.id'), primary_key=True)
+    num_likes = db.Column(db.Integer, nullable=False)
+
+class CatalogState(db.Model):
+    """카탈로그 세대 번호 (포켓몬 데이터가 바뀔 때마다 증가, 모든 워커 프로세스가 공유)"""
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.Integer, default=0, nullable=False)
+    token = db.Column(db.String(32), nullable=False) # DB를 새로 만들면 바뀌는 임의 값 (세대 번호가 다시 0부터 시작해도 구분)
+
+
+def add_missing_columns():
+    """기존 테이블에 모델에는 있지만 DB에는 없는 컬럼을 ALTER TABLE로 추가하고, 추가한 컬럼 이름 목록을 반환합니다.
+
+    NOT NULL 컬럼은 server_default가 있어야 기존 행에 값을 채울 수 있습니다.
+    """
+    inspector = inspect(db.engine)
+    added = []
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                    added.append(f"{table.name}.{column.name}")
+    return added
@@ -0,0 +1,57 @@
+import base64
+import json
+from bisect import bisect_right
+
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    """해석할 수 없는 페이지 커서"""
+
+
+def encode_cursor(last_id):
+    """마지막으로 반환한 키 값을 클라이언트에 넘길 불투명한 커서 문자열로 바꿉니다."""
+    raw = json.dumps({'after': last_id}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열에서 키 값을 꺼냅니다. 빈 커서는 첫 페이지(None)입니다."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        return int(json.loads(raw)['after'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def keyset_page(query, key_column, columns, cursor, per_page):
+    """key_column 순서로 cursor 다음의 한 페이지를 조회합니다. (OFFSET 없이 WHERE key > 마지막 값)
+
+    (행 목록, 다음 페이지 커서) 튜플을 반환하며, 마지막 페이지면 다음 커서는 None입니다.
+    key_column은 columns에 포함되어 있어야 합니다.
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    after = decode_cursor(cursor)
+    if after is not None:
+        query = query.filter(key_column > after)
+    rows = query.with_entities(*columns).order_by(key_column).limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    return rows, encode_cursor(rows[-1]._mapping[key_column])
+
+
+def keyset_slice(keys, cursor, per_page):
+    """정렬된 키 목록에서 cursor 다음의 한 페이지를 잘라냅니다. (keyset_page의 메모리 버전)
+
+    DB에는 잘라낸 페이지의 키만 보내면 되므로 긴 목록을 IN (...)에 통째로 넣지 않아도 됩니다.
+    (페이지 키 목록, 다음 페이지 커서) 튜플을 반환하며, 마지막 페이지면 다음 커서는 None입니다.
+    """
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    after = decode_cursor(cursor)
+    start = 0 if after is None else bisect_right(keys, after)
+    page_keys = keys[start:start + per_page]
+    next_cursor = encode_cursor(page_keys[-1]) if start + per_page < len(keys) else None
+    return page_keys, next_cursor
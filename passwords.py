@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from flask import current_app
+
+# bcrypt는 앞의 72바이트만 사용합니다. (이전 버전 bcrypt가 조용히 잘라내던 것과 같은 결과)
+MAX_PASSWORD_BYTES = 72
+
+
+class PasswordHasherBusy(Exception):
+    """해시 대기열이 가득 찼거나 제한 시간 안에 계산이 끝나지 않았습니다."""
+
+
+# --- 프로세스 풀에서 실행되는 함수 (pickle 가능해야 하므로 모듈 최상위에 둡니다) ---
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8')[:MAX_PASSWORD_BYTES], bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password_hash, password):
+    return bcrypt.checkpw(password.encode('utf-8')[:MAX_PASSWORD_BYTES], password_hash.encode('utf-8'))
+
+
+def hash_rounds(password_hash):
+    """bcrypt 해시 문자열($2b$12$...)의 비용 값. 알 수 없으면 None."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _context():
+    # 여러 스레드가 도는 서버 프로세스를 fork하면 다른 스레드가 잡고 있던 잠금 때문에 워커가 멈출 수 있으므로
+    # forkserver(없으면 spawn)로 워커를 만듭니다. 이때 multiprocessing은 실행한 스크립트(메인 모듈, 예: python app.py의
+    # app.py)를 __mp_main__으로 다시 불러옵니다. (forkserver는 서버 프로세스에서 한 번, spawn은 워커마다)
+    # 스크립트의 실행 코드가 if __name__ == '__main__': 아래에 없으면 워커가 시작되지 못해 풀이 깨지고(BrokenProcessPool)
+    # 해시 요청은 PasswordHasherBusy(503)로 실패합니다. gunicorn/waitress로 wsgi:app을 실행할 때는 해당하지 않습니다.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+class PasswordHasher:
+    """bcrypt 해시 계산/검증을 요청 스레드 밖의 프로세스 풀에서 실행합니다.
+
+    동시에 처리 중인(대기 포함) 작업은 PASSWORD_HASH_MAX_PENDING개로 제한하고, 자리가 나기를
+    PASSWORD_HASH_TIMEOUT초까지 기다린 뒤에도 없거나 계산이 늦어지면 PasswordHasherBusy를 발생시킵니다.
+    PASSWORD_HASH_WORKERS가 0이면 호출한 스레드에서 바로 계산합니다.
+    """
+
+    def __init__(self, app=None):
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.rejected = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('BCRYPT_LOG_ROUNDS', 12)
+        app.config.setdefault('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1))
+        app.config.setdefault('PASSWORD_HASH_MAX_PENDING', 32)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', 5.0)
+        app.extensions['password_hasher'] = self
+
+    def _pool(self, config):
+        with self._lock:
+            # WSGI 서버가 fork한 워커 프로세스에서는 부모의 풀을 쓸 수 없으므로 새로 만듭니다.
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=config['PASSWORD_HASH_WORKERS'], mp_context=_context())
+                self._slots = threading.BoundedSemaphore(config['PASSWORD_HASH_MAX_PENDING'])
+                self._pid = os.getpid()
+            return self._executor, self._slots
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, function, *args):
+        config = current_app.config
+        if not config['PASSWORD_HASH_WORKERS']:
+            return function(*args)
+
+        timeout = config['PASSWORD_HASH_TIMEOUT']
+        deadline = time.monotonic() + timeout
+        executor, slots = self._pool(config)
+        if not slots.acquire(timeout=timeout):
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self._reset(executor)
+            raise PasswordHasherBusy()
+        # 시간 초과로 먼저 돌아가더라도 자리는 작업이 실제로 끝날 때 돌려줍니다.
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            future.cancel()
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise PasswordHasherBusy()
+
+    def hash(self, password):
+        """설정된 비용(BCRYPT_LOG_ROUNDS)으로 비밀번호를 해시합니다."""
+        return self._run(_hash, password, current_app.config['BCRYPT_LOG_ROUNDS'])
+
+    def check(self, password_hash, password):
+        return self._run(_check, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """해시의 비용이 현재 설정과 다르면 True"""
+        return hash_rounds(password_hash) != current_app.config['BCRYPT_LOG_ROUNDS']
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,169 @@
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from fileutil import atomic_write
+
+SPECIES_API_URL = 'https://pokeapi.co/api/v2/pokemon-species/{id}/'
+POKEMON_API_URL = 'https://pokeapi.co/api/v2/pokemon/{id}/'
+CACHE_DIR = 'pokeapi_cache'
+
+# 재시도할 HTTP 상태 코드 (요청 과다, 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """초당 rate개의 요청을 허용하는 토큰 버킷 (최대 capacity개까지 몰아서 허용)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰이 생길 때까지 기다린 뒤 하나를 가져갑니다."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedFetcher(ABC):
+    """요청 속도 제한과 일시적 오류(429/5xx) 재시도를 하며 여러 URL을 병렬로 가져오는 HTTP 클라이언트
+
+    하위 클래스는 fetch(key)를 구현하고, 그 안에서 _get()으로 요청합니다.
+    session을 넘기면 (로컬 스텁 서버용 세션이나 테스트용 가짜 세션 등) 그 세션으로 요청합니다.
+    """
+
+    def __init__(self, max_workers=8, rate=20, retries=3, backoff=0.5, timeout=10, session=None):
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate)
+        if session is None:
+            # 워커 수만큼 커넥션을 재사용하는 세션
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def _get(self, url, label, parse):
+        """url 응답을 parse(response)로 변환해 반환합니다. 끝내 가져오지 못하면 None.
+
+        429/5xx, 연결 오류, parse의 ValueError(잘못된 JSON 등)는 지수 백오프로 재시도하고, 404 등은 재시도하지 않습니다.
+        """
+        error = None
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return parse(response)
+                error = f"status {response.status_code}"
+            except requests.exceptions.HTTPError as e:
+                print(f"Error fetching {label}: {e}")
+                return None
+            except (requests.exceptions.RequestException, ValueError) as e:
+                error = e
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        print(f"Error fetching {label} after {self.retries + 1} attempts: {error}")
+        return None
+
+    @abstractmethod
+    def fetch(self, key):
+        """key 하나의 결과를 반환합니다. 끝내 가져오지 못하면 None."""
+
+    def fetch_many(self, keys):
+        """여러 키를 동시에 가져와 {키: 결과 또는 None} 딕셔너리로 반환합니다."""
+        keys = list(dict.fromkeys(keys))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(keys, executor.map(self.fetch, keys)))
+
+
+class SpeciesFetcher(RateLimitedFetcher):
+    """PokeAPI pokemon-species 응답을 병렬로 가져오고 디스크에 캐시합니다.
+
+    base_url과 cache_dir을 바꾸면 로컬 스텁 서버나 미리 저장한 응답으로 오프라인 실행할 수 있습니다.
+    다른 자원(예: base_url=POKEMON_API_URL, resource='pokemon')도 같은 방식으로 가져올 수 있습니다.
+    """
+
+    def __init__(self, base_url=SPECIES_API_URL, cache_dir=CACHE_DIR, resource='species', **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.resource = resource
+
+    def _cache_path(self, species_id):
+        return os.path.join(self.cache_dir, self.resource, f'{species_id}.json')
+
+    def _read_cache(self, species_id):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(species_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, species_id, data):
+        if not self.cache_dir:
+            return
+        with atomic_write(self._cache_path(species_id), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def fetch(self, species_id):
+        """species 응답(dict)을 반환합니다. 끝내 가져오지 못하면 None."""
+        data = self._read_cache(species_id)
+        if data is not None:
+            return data
+
+        data = self._get(self.base_url.format(id=species_id), f"{self.resource} data for id {species_id}",
+                         lambda response: response.json())
+        if data is not None:
+            self._write_cache(species_id, data)
+        return data
+
+
+def korean_flavor_text(species):
+    """species 응답에서 한국어 도감 설명을 찾습니다. 없으면 빈 문자열."""
+    for entry in (species or {}).get('flavor_text_entries', []):
+        if entry.get('language', {}).get('name') == 'ko':
+            return entry['flavor_text'].replace('\n', ' ').replace('\x0c', ' ')
+    return ""
+
+
+def get_evolution_chain_id(url):
+    """Evolution chain URL에서 ID를 추출합니다."""
+    if not url or not isinstance(url, str):
+        return None
+    match = re.search(r'/(\d+)/$', url)
+    return int(match.group(1)) if match else None
+
+
+def evolution_chain_id(species):
+    """species 응답에서 evolution_chain_id를 추출합니다."""
+    return get_evolution_chain_id(((species or {}).get('evolution_chain') or {}).get('url'))
+
+
+def sprite_url(pokemon):
+    """pokemon 응답에서 스프라이트 이미지 URL을 찾습니다. (공식 일러스트 우선) 없으면 빈 문자열."""
+    sprites = (pokemon or {}).get('sprites') or {}
+    artwork = ((sprites.get('other') or {}).get('official-artwork') or {}).get('front_default')
+    return artwork or sprites.get('front_default') or ""
@@ -0,0 +1,165 @@
+import threading
+from collections import OrderedDict
+from sqlalchemy import bindparam, delete, func, insert, literal, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db, chunked, User, UserLike, PokemonTag, UserProfile, UserTagCount
+
+
+def upsert(model):
+    """현재 DB(SQLite/PostgreSQL)의 INSERT ... ON CONFLICT 구문을 만듭니다."""
+    dialect = db.session.get_bind().dialect.name
+    return (postgresql if dialect == 'postgresql' else sqlite).insert(model)
+
+
+def _tag_counts(pokemon_ids):
+    """포켓몬들의 태그별 개수를 (tag_id, 개수) 목록으로 반환합니다."""
+    return (db.session.query(PokemonTag.tag_id, func.count())
+            .filter(PokemonTag.pokemon_id.in_(list(pokemon_ids)))
+            .group_by(PokemonTag.tag_id)
+            .all())
+
+
+def rebuild_user_profiles(user_ids=None):
+    """UserLike로부터 사용자 태그 프로필을 다시 계산합니다. user_ids가 None이면 전체 사용자. (commit은 호출한 쪽에서)"""
+    clear = delete(UserTagCount)
+    counts = (select(UserLike.user_id, PokemonTag.tag_id, func.count())
+              .join(PokemonTag, PokemonTag.pokemon_id == UserLike.pokemon_id)
+              .group_by(UserLike.user_id, PokemonTag.tag_id))
+    # SQLite는 INSERT ... SELECT ... ON CONFLICT의 SELECT에 WHERE 절이 있어야 구문을 해석할 수 있습니다.
+    users = select(User.id, literal(0)).where(true())
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        clear = clear.where(UserTagCount.user_id.in_(user_ids))
+        counts = counts.where(UserLike.user_id.in_(user_ids))
+        users = users.where(User.id.in_(user_ids))
+
+    db.session.execute(clear)
+    db.session.execute(insert(UserTagCount).from_select(['user_id', 'tag_id', 'num_likes'], counts))
+    db.session.execute(upsert(UserProfile).from_select(['user_id', 'likes_version'], users).on_conflict_do_nothing())
+
+
+def rebuild_profiles_for_pokemon(pokemon_ids):
+    """포켓몬의 태그가 바뀌었을 때, 그 포켓몬을 '좋아요'한 사용자들의 프로필을 다시 계산합니다.
+
+    포켓몬과 사용자 id는 MAX_IN_IDS개씩 나눠 조회합니다.
+    """
+    user_ids = set()
+    for chunk in chunked(pokemon_ids):
+        user_ids.update(user_id for (user_id,) in db.session.query(UserLike.user_id)
+                        .filter(UserLike.pokemon_id.in_(chunk)).distinct())
+    for chunk in chunked(sorted(user_ids)):
+        rebuild_user_profiles(chunk)
+
+
+def likes_version(user_id):
+    """사용자의 현재 likes_version을 반환합니다. 프로필이 없으면 None."""
+    return db.session.query(UserProfile.likes_version).filter_by(user_id=user_id).scalar()
+
+
+def apply_like_changes(user_id, added_ids=(), removed_ids=()):
+    """'좋아요' 추가/취소를 사용자 태그 프로필에 반영하고 증가한 likes_version을 반환합니다. (commit은 호출한 쪽에서)
+
+    UserLike 변경은 호출한 쪽에서 먼저 세션에 반영되어 있어야 합니다.
+    """
+    if likes_version(user_id) is None:
+        # 아직 프로필이 없는 사용자는 전체 '좋아요'로부터 한 번 만들어 둡니다.
+        db.session.flush()
+        rebuild_user_profiles([user_id])
+    else:
+        if added_ids:
+            rows = [{'user_id': user_id, 'tag_id': tag_id, 'num_likes': count} for tag_id, count in _tag_counts(added_ids)]
+            if rows:
+                stmt = upsert(UserTagCount)
+                stmt = stmt.on_conflict_do_update(index_elements=['user_id', 'tag_id'],
+                                                  set_={'num_likes': UserTagCount.num_likes + stmt.excluded.num_likes})
+                db.session.execute(stmt, rows)
+        if removed_ids:
+            rows = [{'b_tag_id': tag_id, 'b_count': count} for tag_id, count in _tag_counts(removed_ids)]
+            if rows:
+                table = UserTagCount.__table__
+                db.session.execute(update(table)
+                                   .where(table.c.user_id == user_id, table.c.tag_id == bindparam('b_tag_id'))
+                                   .values(num_likes=table.c.num_likes - bindparam('b_count')), rows)
+                db.session.execute(delete(UserTagCount).where(UserTagCount.user_id == user_id,
+                                                              UserTagCount.num_likes <= 0))
+
+    db.session.execute(update(UserProfile).where(UserProfile.user_id == user_id)
+                       .values(likes_version=UserProfile.likes_version + 1))
+    return likes_version(user_id)
+
+
+def set_likes(user_id, like_ids=(), unlike_ids=()):
+    """여러 포켓몬의 '좋아요'/취소를 한 번에 기록하고 실제로 바뀐 (추가된 id 목록, 취소된 id 목록)을 반환합니다. (commit은 호출한 쪽에서)
+
+    이미 '좋아요'한 포켓몬은 INSERT ... ON CONFLICT DO NOTHING으로 건너뛰고, 취소는 한 번의 DELETE로 처리합니다.
+    """
+    user_id = int(user_id)
+    added_ids, removed_ids = [], []
+    if like_ids:
+        stmt = (upsert(UserLike).values([{'user_id': user_id, 'pokemon_id': pokemon_id} for pokemon_id in like_ids])
+                .on_conflict_do_nothing(index_elements=['user_id', 'pokemon_id'])
+                .returning(UserLike.pokemon_id))
+        added_ids = db.session.execute(stmt).scalars().all()
+    if unlike_ids:
+        stmt = (delete(UserLike)
+                .where(UserLike.user_id == user_id, UserLike.pokemon_id.in_(list(unlike_ids)))
+                .returning(UserLike.pokemon_id))
+        removed_ids = db.session.execute(stmt).scalars().all()
+    return sorted(added_ids), sorted(removed_ids)
+
+
+def profile_tag_ids(user_id):
+    """사용자 태그 프로필에 있는 tag_id 목록을 반환합니다."""
+    return [tag_id for (tag_id,) in db.session.query(UserTagCount.tag_id).filter_by(user_id=user_id)]
+
+
+class LikedIdsCache:
+    """사용자별 '좋아요' id 집합을 likes_version과 함께 보관하는 LRU 캐시"""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        user_id = int(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id, version, liked_ids):
+        user_id = int(user_id)
+        with self._lock:
+            self._entries[user_id] = (version, frozenset(liked_ids))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_liked_cache = LikedIdsCache()
+
+
+def get_liked_ids(user_id, version=None):
+    """사용자가 '좋아요'한 pokemon_id를 정렬된 목록으로 반환합니다. likes_version이 같으면 캐시를 사용합니다."""
+    if version is None:
+        version = likes_version(user_id)
+    liked_ids = _liked_cache.get(user_id, version) if version is not None else None
+    if liked_ids is None:
+        liked_ids = frozenset(pokemon_id for (pokemon_id,) in
+                              db.session.query(UserLike.pokemon_id).filter_by(user_id=user_id))
+        if version is not None:
+            _liked_cache.put(user_id, version, liked_ids)
+    return sorted(liked_ids)
+
+
+def update_liked_ids(user_id, new_version, added_ids=(), removed_ids=()):
+    """'좋아요' 변경 후의 id 목록을 반환합니다. 직전 버전이 캐시에 있으면 다시 조회하지 않습니다."""
+    previous = _liked_cache.get(user_id, new_version - 1)
+    if previous is None:
+        return get_liked_ids(user_id, new_version)
+    liked_ids = (previous | set(added_ids)) - set(removed_ids)
+    _liked_cache.put(user_id, new_version, liked_ids)
+    return sorted(liked_ids)
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class InProcessBackend:
+    """프로세스 메모리에 보관하는 LRU/TTL 캐시 (전체 크기를 max_bytes 이하로 유지)"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict() # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+    def stats(self):
+        return {'backend': 'memory', 'entries': len(self._entries), 'bytes': self.size, 'max_bytes': self.max_bytes}
+
+
+class RedisBackend:
+    """Redis 호환 저장소를 사용하는 캐시 (get/set(ex=...)을 지원하는 클라이언트면 무엇이든 가능)
+
+    메모리 상한은 저장소의 maxmemory/eviction 정책을 따릅니다.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RECOMMEND_CACHE_URL에 Redis를 사용하려면 'redis' 패키지를 설치하세요.")
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, value, ttl):
+        self.client.set(key, value, ex=ttl)
+
+    def stats(self):
+        return {'backend': 'redis'}
+
+
+class RecommendationCache:
+    """개인화 추천 결과(직렬화된 응답 본문) 캐시
+
+    키에 사용자의 likes_version과 카탈로그 버전이 들어가므로, '좋아요'나 카탈로그가 바뀌면
+    이전 결과는 더 이상 조회되지 않고 LRU/TTL로 밀려납니다.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = 300
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """RECOMMEND_CACHE_URL이 있으면 Redis 호환 저장소를, 없으면 프로세스 메모리를 사용합니다."""
+        url = app.config.get('RECOMMEND_CACHE_URL')
+        self.ttl = app.config.get('RECOMMEND_CACHE_TTL', 300)
+        if url:
+            self.backend = RedisBackend.from_url(url)
+        else:
+            self.backend = InProcessBackend(app.config.get('RECOMMEND_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+        app.extensions['recommendation_cache'] = self
+
+    @staticmethod
+    def make_key(user_id, likes_version, catalog_version, *options):
+        return ':'.join(['rec', str(user_id), str(likes_version), str(catalog_version), *map(str, options)])
+
+    def get(self, key):
+        value = self.backend.get(key) if self.backend is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if self.backend is not None:
+            self.backend.set(key, value, self.ttl)
+
+    def stats(self):
+        """적중/실패 횟수와 백엔드 상태를 반환합니다."""
+        stats = {'hits': self.hits, 'misses': self.misses}
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+
+recommendation_cache = RecommendationCache()
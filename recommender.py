@@ -0,0 +1,91 @@
+import numpy as np
+from catalog import CatalogCache
+from models import db, Pokemon, PokemonTag
+
+# 지원하는 태그 가중치 방식
+WEIGHTINGS = ('binary', 'idf')
+
+
+class RecommendationEngine:
+    """포켓몬 x 태그 희소 행렬 기반 개인화 추천 엔진
+
+    행렬은 (행, 열) 좌표 배열로 보관하며, 점수 계산은 행렬-벡터 곱 한 번으로 끝납니다.
+    """
+
+    def __init__(self, pokemon_ids, links):
+        # pokemon_ids: 전체 포켓몬 id 목록, links: (pokemon_id, tag_id) 튜플 목록
+        self.ids = np.array(sorted(pokemon_ids), dtype=np.int64)
+        positions = {pokemon_id: position for position, pokemon_id in enumerate(self.ids.tolist())}
+        links = [(positions[pokemon_id], tag_id) for pokemon_id, tag_id in links if pokemon_id in positions]
+
+        self.tag_ids = np.array(sorted({tag_id for _, tag_id in links}), dtype=np.int64)
+        tag_positions = {tag_id: position for position, tag_id in enumerate(self.tag_ids.tolist())}
+        self.rows = np.array([row for row, _ in links], dtype=np.int64)
+        self.cols = np.array([tag_positions[tag_id] for _, tag_id in links], dtype=np.int64)
+
+        # 태그별 가중치: 흔한 태그(예: 타입)일수록 낮은 IDF 값을 가집니다.
+        document_frequency = np.bincount(self.cols, minlength=len(self.tag_ids))
+        self.weights = {
+            'binary': np.ones(len(self.tag_ids)),
+            'idf': np.log((1 + len(self.ids)) / (1 + document_frequency)) + 1,
+        }
+
+    @classmethod
+    def from_db(cls):
+        """정규화된 태그 테이블에서 행렬을 만듭니다."""
+        pokemon_ids = [row[0] for row in db.session.query(Pokemon.pokemon_id)]
+        links = db.session.query(PokemonTag.pokemon_id, PokemonTag.tag_id).all()
+        return cls(pokemon_ids, links)
+
+    def _positions(self, pokemon_ids):
+        """pokemon_id 목록을 행 위치 배열로 변환합니다. (없는 id는 무시)"""
+        pokemon_ids = np.asarray(list(pokemon_ids), dtype=np.int64)
+        _, positions, _ = np.intersect1d(self.ids, pokemon_ids, return_indices=True)
+        return positions
+
+    def profile(self, liked_ids):
+        """'좋아요'한 포켓몬들이 가진 태그를 1로 표시한 사용자 프로필 벡터를 만듭니다."""
+        liked_rows = np.zeros(len(self.ids), dtype=bool)
+        liked_rows[self._positions(liked_ids)] = True
+        vector = np.zeros(len(self.tag_ids))
+        vector[self.cols[liked_rows[self.rows]]] = 1.0
+        return vector
+
+    def profile_from_tags(self, tag_ids):
+        """저장된 사용자 태그 프로필(tag_id 목록)을 프로필 벡터로 만듭니다."""
+        tag_ids = np.asarray(list(tag_ids), dtype=np.int64)
+        _, positions, _ = np.intersect1d(self.tag_ids, tag_ids, return_indices=True)
+        vector = np.zeros(len(self.tag_ids))
+        vector[positions] = 1.0
+        return vector
+
+    def score(self, profile, weighting='idf'):
+        """프로필 벡터에 대한 모든 포켓몬의 유사도 점수 배열을 반환합니다. (self.ids와 같은 순서)"""
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"Unknown weighting: {weighting}")
+        weighted_profile = profile * self.weights[weighting]
+        return np.bincount(self.rows, weights=weighted_profile[self.cols], minlength=len(self.ids))
+
+    def top_k(self, scores, k, exclude_ids=()):
+        """점수가 높은 상위 k개의 pokemon_id를 반환합니다. (동점이면 id 오름차순)"""
+        candidates = scores.astype(float)
+        candidates[self._positions(exclude_ids)] = -np.inf
+        k = min(k, int(np.isfinite(candidates).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-candidates, k - 1)[:k]
+        top = top[np.lexsort((self.ids[top], -candidates[top]))]
+        return self.ids[top].tolist()
+
+    def scores_for(self, scores, pokemon_ids):
+        """주어진 pokemon_id들의 점수를 {pokemon_id: score} 딕셔너리로 반환합니다."""
+        positions = self._positions(pokemon_ids)
+        return dict(zip(self.ids[positions].tolist(), scores[positions].tolist()))
+
+
+_engine = CatalogCache(RecommendationEngine.from_db)
+
+
+def get_recommendation_engine():
+    """현재 카탈로그 버전의 추천 엔진을 반환합니다."""
+    return _engine.get()
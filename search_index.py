@@ -0,0 +1,135 @@
+from catalog import CatalogCache
+from snapshot import get_catalog_snapshot
+
+# 한글 음절의 초성 (유니코드 순서)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_START, HANGUL_END = 0xAC00, 0xD7A3
+
+# 오타 허용 검색에서 후보로 인정할 최소 바이그램 유사도 (Dice 계수)
+FUZZY_THRESHOLD = 0.5
+
+
+def normalize(text):
+    """검색용으로 공백을 없애고 소문자로 바꿉니다."""
+    return ''.join((text or '').split()).lower()
+
+
+def choseong(text):
+    """한글 음절을 초성으로 바꿉니다. (예: '피카츄' -> 'ㅍㅋㅊ') 한글이 아닌 문자는 그대로 둡니다."""
+    return ''.join(CHOSEONG[(ord(char) - HANGUL_START) // 588] if HANGUL_START <= ord(char) <= HANGUL_END else char
+                   for char in text)
+
+
+def is_choseong_query(text):
+    return bool(text) and all(char in CHOSEONG for char in text)
+
+
+def ngrams(text, n=2):
+    """문자 n-gram 집합을 반환합니다. 문자열이 n보다 짧으면 문자열 자체를 사용합니다."""
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """포켓몬 한글/영문 이름 n-gram 색인 (부분 일치, 초성, 오타 허용 검색)"""
+
+    def __init__(self, rows):
+        # rows: (pokemon_id, name_ko, name_en, image_url) 튜플 목록
+        self.entries = []
+        self._bigrams = {}
+        self._chars = {}
+        for pokemon_id, name_ko, name_en, image_url in rows:
+            names = list(dict.fromkeys(name for name in (normalize(name_ko), normalize(name_en)) if name))
+            position = len(self.entries)
+            self.entries.append({
+                'pokemon_id': pokemon_id,
+                'name_ko': name_ko,
+                'name_en': name_en,
+                'image_url': image_url,
+                'names': names,
+                'choseong': choseong(normalize(name_ko)),
+            })
+            for name in names:
+                for gram in ngrams(name):
+                    self._bigrams.setdefault(gram, set()).add(position)
+                for char in name:
+                    self._chars.setdefault(char, set()).add(position)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """카탈로그 스냅샷의 이름 컬럼으로 색인을 만듭니다."""
+        return cls(zip(*(snapshot.column(name) for name in ('pokemon_id', 'name_ko', 'name_en', 'image_url'))))
+
+    def _candidates(self, query):
+        """query를 부분 문자열로 가질 수 있는 항목 위치 집합을 n-gram 교집합으로 구합니다."""
+        postings = self._chars if len(query) < 2 else self._bigrams
+        grams = set(query) if len(query) < 2 else ngrams(query)
+        candidates = None
+        for gram in grams:
+            posting = postings.get(gram, set())
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _score(self, entry, query):
+        """일치 정도 점수: 완전 일치 > 접두사 > 부분 일치. 일치하지 않으면 0."""
+        best = 0.0
+        for name in entry['names']:
+            if name == query:
+                return 3.0
+            if name.startswith(query):
+                best = max(best, 2.0)
+            elif query in name:
+                best = max(best, 1.0)
+        return best
+
+    def search(self, query, limit=None, fuzzy=False):
+        """이름 검색 결과를 (점수, 항목) 목록으로 점수 순으로 반환합니다.
+
+        초성만으로 된 검색어는 초성 접두사/부분 일치로, fuzzy=True면 일치 결과가 없을 때
+        바이그램 유사도로 오타를 허용해 찾습니다.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        results = []
+        if is_choseong_query(query):
+            for entry in self.entries:
+                if entry['choseong'].startswith(query):
+                    results.append((2.0, entry))
+                elif query in entry['choseong']:
+                    results.append((1.0, entry))
+        else:
+            for position in self._candidates(query):
+                entry = self.entries[position]
+                score = self._score(entry, query)
+                if score:
+                    results.append((score, entry))
+
+            if not results and fuzzy and len(query) >= 2:
+                query_grams = ngrams(query)
+                candidates = set().union(*(self._bigrams.get(gram, set()) for gram in query_grams))
+                for position in candidates:
+                    entry = self.entries[position]
+                    similarity = max(2 * len(query_grams & ngrams(name)) / (len(query_grams) + len(ngrams(name)))
+                                     for name in entry['names'])
+                    if similarity >= FUZZY_THRESHOLD:
+                        results.append((similarity, entry))
+
+        results.sort(key=lambda result: (-result[0], min(map(len, result[1]['names']), default=0), result[1]['pokemon_id']))
+        return results[:limit] if limit else results
+
+    def match_ids(self, query):
+        """검색어와 일치하는 pokemon_id 목록을 반환합니다. (오타 허용 없음)"""
+        return sorted(entry['pokemon_id'] for _, entry in self.search(query))
+
+
+_index = CatalogCache(lambda: SearchIndex.from_snapshot(get_catalog_snapshot()))
+
+
+def get_search_index():
+    """현재 카탈로그 버전의 이름 검색 색인을 반환합니다."""
+    return _index.get()
@@ -0,0 +1,59 @@
+from flask import current_app
+from models import Pokemon
+
+try:
+    import orjson
+except ImportError: # orjson이 없으면 Flask 기본 JSON 인코더를 사용합니다.
+    orjson = None
+
+# Pokemon의 전체 컬럼과 목록 화면용 컬럼 (긴 설명 제외)
+POKEMON_FIELDS = tuple(column.name for column in Pokemon.__table__.columns)
+LIST_FIELDS = tuple(field for field in POKEMON_FIELDS if field != 'description')
+
+
+def parse_fields(value, default=LIST_FIELDS):
+    """요청의 fields 값(리스트 또는 쉼표로 구분된 문자열)을 응답에 포함할 컬럼 튜플로 바꿉니다.
+
+    'all'이면 전체 컬럼, 비어 있으면 default를 사용하며 pokemon_id는 항상 포함됩니다.
+    """
+    if not value:
+        return default
+    if isinstance(value, str):
+        value = value.split(',')
+    requested = {str(field).strip() for field in value}
+    if 'all' in requested:
+        return POKEMON_FIELDS
+    requested.add('pokemon_id')
+    return tuple(field for field in POKEMON_FIELDS if field in requested)
+
+
+def pokemon_columns(fields=LIST_FIELDS):
+    """필드 이름 목록에 해당하는 Pokemon 컬럼 목록을 반환합니다. (with_entities용)"""
+    return [getattr(Pokemon, field) for field in fields]
+
+
+def rows_to_dicts(rows, fields=LIST_FIELDS):
+    """with_entities로 조회한 튜플 목록을 딕셔너리 목록으로 바꿉니다."""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def pokemon_dicts(query, fields=LIST_FIELDS):
+    """Pokemon 쿼리에서 필요한 컬럼만 튜플로 조회해 딕셔너리 목록으로 반환합니다. (ORM 객체를 만들지 않습니다)"""
+    return rows_to_dicts(query.with_entities(*pokemon_columns(fields)), fields)
+
+
+def encode_json(payload):
+    """payload를 JSON 바이트로 인코딩합니다. orjson이 설치되어 있으면 orjson을 사용합니다."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return current_app.json.dumps(payload).encode('utf-8')
+
+
+def json_response(payload, status=200):
+    """payload를 JSON 응답으로 만듭니다."""
+    return json_body_response(encode_json(payload), status)
+
+
+def json_body_response(body, status=200):
+    """이미 인코딩된 JSON 바이트로 응답을 만듭니다."""
+    return current_app.response_class(body, status=status, mimetype='application/json')
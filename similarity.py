@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+from flask import current_app
+from catalog import CatalogCache
+from fileutil import atomic_write
+from models import db, Tag
+from recommender import get_recommendation_engine
+
+# 지원하는 유사도 방식
+METRICS = ('cosine', 'jaccard')
+
+
+def tag_fingerprint(engine):
+    """포켓몬 목록과 포켓몬-태그 연결로만 정해지는 지문
+
+    설명이나 이미지처럼 태그와 무관한 카탈로그 변경에는 바뀌지 않으므로, 미리 계산한 색인을 계속 쓸 수 있습니다.
+    """
+    order = np.lexsort((engine.cols, engine.rows))
+    digest = hashlib.sha1()
+    for array in (engine.ids, engine.tag_ids, engine.rows[order], engine.cols[order]):
+        digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+class SimilarityModel:
+    """포켓몬 x 태그 행렬로 포켓몬 사이의 태그 유사도를 계산합니다.
+
+    category_weights({카테고리: 가중치})로 타입/역할/특징/외형 태그의 비중을 바꿀 수 있습니다.
+    """
+
+    def __init__(self, engine, metric='cosine', category_weights=None, tag_categories=None):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.ids = engine.ids
+        self.metric = metric
+        self.fingerprint = tag_fingerprint(engine)
+        self.category_weights = dict(category_weights or {})
+        tag_categories = tag_categories or {}
+        weights = np.array([self.category_weights.get(tag_categories.get(tag_id), 1.0)
+                            for tag_id in engine.tag_ids.tolist()], dtype=np.float32)
+
+        matrix = np.zeros((len(engine.ids), len(engine.tag_ids)), dtype=np.float32)
+        matrix[engine.rows, engine.cols] = 1.0
+        if metric == 'cosine':
+            weighted = matrix * np.sqrt(weights)
+            norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+            self._left = self._right = weighted / np.where(norms == 0, 1, norms)
+        else:
+            # 가중 Jaccard: 공통 태그 가중치 합 / (양쪽 태그 가중치 합 - 공통 태그 가중치 합)
+            self._left = matrix * weights
+            self._right = matrix
+            self._sizes = matrix @ weights
+
+    @classmethod
+    def from_config(cls, metric=None, category_weights=None):
+        config = current_app.config
+        category_weights = category_weights if category_weights is not None else config.get('SIMILARITY_CATEGORY_WEIGHTS')
+        tag_categories = dict(db.session.query(Tag.id, Tag.category)) if category_weights else None
+        return cls(get_recommendation_engine(), metric or config.get('SIMILARITY_METRIC', 'cosine'),
+                   category_weights, tag_categories)
+
+    def similarities(self, positions):
+        """positions 행의 포켓몬들과 전체 포켓몬 사이의 유사도 행렬 (len(positions) x 전체)"""
+        scores = self._left[positions] @ self._right.T
+        if self.metric == 'jaccard':
+            union = self._sizes[positions][:, None] + self._sizes[None, :] - scores
+            scores = np.divide(scores, union, out=np.zeros_like(scores), where=union > 0)
+        return scores
+
+    def neighbours(self, positions, k):
+        """positions 행마다 자신을 제외한 상위 k개 이웃의 (행 위치 배열, 점수 배열)을 반환합니다.
+
+        유사도가 0인 이웃은 위치 -1, 점수 0으로 채웁니다. 동점이면 pokemon_id 오름차순입니다.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        k = min(k, len(self.ids) - 1)
+        if k <= 0 or not len(positions):
+            return np.full((len(positions), max(k, 0)), -1, dtype=np.int32), np.zeros((len(positions), max(k, 0)), dtype=np.float32)
+        scores = self.similarities(positions)
+        scores[np.arange(len(positions)), positions] = -np.inf
+        neighbour_positions = np.full((len(positions), k), -1, dtype=np.int32)
+        neighbour_scores = np.zeros((len(positions), k), dtype=np.float32)
+        for row, row_scores in enumerate(scores):
+            # k번째 점수와 같은 후보까지 모두 포함해 정렬해야 동점 처리가 항상 같습니다.
+            threshold = row_scores[np.argpartition(-row_scores, k - 1)[k - 1]]
+            candidates = np.flatnonzero(row_scores >= threshold) if threshold > 0 else np.flatnonzero(row_scores > 0)
+            candidates = candidates[np.lexsort((self.ids[candidates], -row_scores[candidates]))][:k]
+            neighbour_positions[row, :len(candidates)] = candidates
+            neighbour_scores[row, :len(candidates)] = row_scores[candidates]
+        return neighbour_positions, neighbour_scores
+
+    def similar(self, pokemon_id, limit=10):
+        """pokemon_id의 이웃을 [(pokemon_id, 점수)] 목록으로 바로 계산합니다. 없는 포켓몬이면 None."""
+        positions = np.flatnonzero(self.ids == pokemon_id)
+        if not len(positions):
+            return None
+        neighbour_positions, scores = self.neighbours(positions, limit)
+        found = neighbour_positions[0] >= 0
+        return list(zip(self.ids[neighbour_positions[0][found]].tolist(), scores[0][found].tolist()))
+
+    def build_index(self, k=20, block_size=128):
+        """전체 포켓몬의 상위 k개 이웃을 block_size행씩 계산해 SimilarityIndex로 반환합니다."""
+        blocks = [self.neighbours(np.arange(start, min(start + block_size, len(self.ids))), k)
+                  for start in range(0, len(self.ids), block_size)]
+        k = blocks[0][0].shape[1] if blocks else 0
+        positions = np.vstack([block[0] for block in blocks]) if blocks else np.zeros((0, k), dtype=np.int32)
+        scores = np.vstack([block[1] for block in blocks]) if blocks else np.zeros((0, k), dtype=np.float32)
+        neighbour_ids = np.where(positions >= 0, self.ids[np.maximum(positions, 0)], -1).astype(np.int32)
+        return SimilarityIndex(self.ids, neighbour_ids, scores, {
+            'metric': self.metric, 'k': k, 'category_weights': self.category_weights,
+            'tag_fingerprint': self.fingerprint,
+        })
+
+
+class SimilarityIndex:
+    """미리 계산한 포켓몬별 상위 K개 이웃 (pokemon_id 순 행, int32 이웃 id / float32 점수)
+
+    version은 불러온 색인 파일을 구분하는 값(파일 수정 시각, ns)으로, 색인이 다시 만들어지면 바뀝니다.
+    """
+
+    def __init__(self, ids, neighbour_ids, scores, meta, version=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.neighbour_ids = neighbour_ids
+        self.scores = scores
+        self.meta = meta
+        self.version = version
+
+    def save(self, path):
+        """.npz 파일로 원자적으로 저장합니다."""
+        with atomic_write(path) as f:
+            np.savez(f, ids=self.ids, neighbour_ids=self.neighbour_ids, scores=self.scores,
+                     meta=np.array(json.dumps(self.meta)))
+
+    @classmethod
+    def load(cls, path, version=None):
+        with np.load(path) as data:
+            return cls(data['ids'], data['neighbour_ids'], data['scores'], json.loads(str(data['meta'])), version)
+
+    def _positions(self, pokemon_ids):
+        pokemon_ids = np.asarray(list(pokemon_ids), dtype=np.int64)
+        _, positions, _ = np.intersect1d(self.ids, pokemon_ids, return_indices=True)
+        return positions
+
+    def similar(self, pokemon_id, limit=None):
+        """pokemon_id의 이웃을 [(pokemon_id, 점수)] 목록으로 점수 순으로 반환합니다. 없는 포켓몬이면 None."""
+        positions = self._positions([pokemon_id])
+        if not len(positions):
+            return None
+        neighbour_ids, scores = self.neighbour_ids[positions[0]], self.scores[positions[0]]
+        found = neighbour_ids >= 0
+        pairs = list(zip(neighbour_ids[found].tolist(), scores[found].tolist()))
+        return pairs[:limit] if limit else pairs
+
+    def recommend(self, liked_ids, k=20):
+        """'좋아요'한 포켓몬들의 이웃 목록을 합쳐 점수 합이 높은 상위 k개의 (id 목록, {id: 점수})를 반환합니다.
+
+        계산량은 카탈로그 크기가 아니라 '좋아요' 수 x K에 비례합니다.
+        """
+        positions = self._positions(liked_ids)
+        neighbour_ids = self.neighbour_ids[positions].ravel()
+        scores = self.scores[positions].ravel()
+        keep = (neighbour_ids >= 0) & ~np.isin(neighbour_ids, np.asarray(list(liked_ids), dtype=np.int64))
+        candidate_ids, inverse = np.unique(neighbour_ids[keep], return_inverse=True)
+        totals = np.bincount(inverse, weights=scores[keep], minlength=len(candidate_ids))
+        order = np.lexsort((candidate_ids, -totals))[:k]
+        top_ids = candidate_ids[order].tolist()
+        return top_ids, dict(zip(top_ids, totals[order].tolist()))
+
+
+def index_path():
+    return current_app.config.get('SIMILARITY_INDEX_PATH') or os.path.join(current_app.instance_path, 'similarity.npz')
+
+
+_loaded = {'key': None, 'index': None}
+_loaded_lock = threading.Lock()
+
+
+_fingerprint = CatalogCache(lambda: tag_fingerprint(get_recommendation_engine()))
+
+
+def get_similarity_index():
+    """현재 포켓몬-태그 연결로 만든 이웃 색인을 반환합니다. 색인 파일이 없거나 태그 연결이 바뀌었으면 None.
+
+    파일이 다시 만들어지면(build-similarity) 다음 요청에서 새로 읽습니다.
+    """
+    path = index_path()
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    key = (path, modified)
+    if _loaded['key'] != key:
+        with _loaded_lock:
+            if _loaded['key'] != key:
+                _loaded['index'] = SimilarityIndex.load(path, version=modified)
+                _loaded['key'] = key
+    index = _loaded['index']
+    return index if index.meta.get('tag_fingerprint') == _fingerprint.get() else None
+
+
+_model = CatalogCache(SimilarityModel.from_config)
+
+
+def get_similarity_model():
+    """설정(SIMILARITY_METRIC, SIMILARITY_CATEGORY_WEIGHTS)에 따른 현재 카탈로그의 유사도 모델을 반환합니다."""
+    return _model.get()
+
+
+def similar_pokemon(pokemon_id, limit=10):
+    """비슷한 포켓몬 [(pokemon_id, 점수)] 목록. 최신 색인이 있으면 색인에서 읽고, 없으면 이 포켓몬만 바로 계산합니다."""
+    index = get_similarity_index()
+    if index is not None and limit <= index.meta['k']:
+        return index.similar(pokemon_id, limit)
+    return get_similarity_model().similar(pokemon_id, limit)
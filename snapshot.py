@@ -0,0 +1,136 @@
+import os
+import shutil
+import numpy as np
+from flask import current_app
+from catalog import CatalogCache, catalog_generation, catalog_version
+from models import db, Pokemon
+
+COLUMNS = tuple(column.name for column in Pokemon.__table__.columns)
+INTEGER_COLUMNS = frozenset(column.name for column in Pokemon.__table__.columns
+                            if isinstance(column.type, db.Integer))
+
+
+class CatalogSnapshot:
+    """포켓몬 카탈로그의 읽기 전용 컬럼 단위 스냅샷
+
+    모든 배열은 pokemon_id 순서이며, 정수 컬럼은 int64 배열, 문자열 컬럼은 UTF-8 바이트 배열과
+    각 값의 시작 위치(offsets) 배열로 보관합니다. 디스크에 저장한 스냅샷은 mmap으로 읽으므로
+    같은 파일을 연 워커 프로세스들이 메모리를 공유합니다.
+    """
+
+    def __init__(self, arrays):
+        # arrays: '{컬럼}.values' / '{컬럼}.offsets' / '{컬럼}.nulls' -> ndarray
+        self.arrays = arrays
+        self.ids = arrays['pokemon_id.values']
+
+    @classmethod
+    def from_rows(cls, rows):
+        """COLUMNS 순서의 튜플 목록(pokemon_id 순)으로 스냅샷을 만듭니다."""
+        columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+        arrays = {}
+        for name, values in zip(COLUMNS, columns):
+            arrays[f'{name}.nulls'] = np.array([value is None for value in values], dtype=bool)
+            if name in INTEGER_COLUMNS:
+                arrays[f'{name}.values'] = np.array([0 if value is None else value for value in values], dtype=np.int64)
+            else:
+                encoded = [b'' if value is None else str(value).encode('utf-8') for value in values]
+                arrays[f'{name}.offsets'] = np.concatenate(([0], np.cumsum([len(value) for value in encoded]))).astype(np.int64)
+                arrays[f'{name}.values'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(arrays)
+
+    @classmethod
+    def from_db(cls):
+        """DB에서 전체 포켓몬을 컬럼 튜플로 한 번 조회해 스냅샷을 만듭니다."""
+        columns = [getattr(Pokemon, name) for name in COLUMNS]
+        return cls.from_rows(db.session.query(*columns).order_by(Pokemon.pokemon_id).all())
+
+    def save(self, path):
+        """배열들을 path 디렉터리에 .npy 파일로 저장합니다. 임시 디렉터리에 쓴 뒤 이름을 바꾸므로
+        다른 프로세스가 저장 중인 스냅샷을 읽는 일은 없습니다."""
+        temp_path = f"{path}.tmp-{os.getpid()}"
+        os.makedirs(temp_path, exist_ok=True)
+        for key, array in self.arrays.items():
+            np.save(os.path.join(temp_path, f"{key}.npy"), array)
+        try:
+            os.rename(temp_path, path)
+        except OSError: # 다른 워커가 먼저 저장했으면 그 스냅샷을 사용합니다.
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path):
+        """save()로 저장한 스냅샷을 mmap으로 엽니다."""
+        return cls({name[:-len('.npy')]: np.load(os.path.join(path, name), mmap_mode='r')
+                    for name in os.listdir(path) if name.endswith('.npy')})
+
+    def __len__(self):
+        return len(self.ids)
+
+    def positions(self, pokemon_ids):
+        """pokemon_id 목록의 배열 위치를 요청 순서대로 반환합니다. 없는 id는 건너뜁니다."""
+        ids = np.asarray(list(pokemon_ids), dtype=np.int64)
+        if not len(self.ids) or not len(ids):
+            return np.array([], dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.ids, ids), len(self.ids) - 1)
+        return positions[self.ids[positions] == ids]
+
+    def value(self, name, position):
+        if self.arrays[f'{name}.nulls'][position]:
+            return None
+        values = self.arrays[f'{name}.values']
+        offsets = self.arrays.get(f'{name}.offsets')
+        if offsets is None:
+            return int(values[position])
+        return bytes(values[offsets[position]:offsets[position + 1]]).decode('utf-8')
+
+    def column(self, name):
+        """컬럼 전체 값을 pokemon_id 순서의 목록으로 반환합니다."""
+        return [self.value(name, position) for position in range(len(self))]
+
+    def rows(self, pokemon_ids, fields=COLUMNS):
+        """pokemon_id 목록에 해당하는 포켓몬을 딕셔너리 목록으로 반환합니다."""
+        return [{field: self.value(field, position) for field in fields} for position in self.positions(pokemon_ids)]
+
+    def get(self, pokemon_id, fields=COLUMNS):
+        """포켓몬 한 마리를 딕셔너리로 반환합니다. 없으면 None."""
+        rows = self.rows([pokemon_id], fields)
+        return rows[0] if rows else None
+
+
+def _remove_old_snapshots(directory, token, generation):
+    """같은 DB의 두 세대 이상 지난 스냅샷과 다른 DB의 스냅샷을 지웁니다. (이미 열려 있는 mmap은 그대로 유지됩니다)
+
+    바로 이전 세대는 남겨 두어, 세대가 바뀌는 순간 아직 그 스냅샷을 열고 있는 다른 워커가 파일을 잃지 않게 합니다.
+    """
+    for name in os.listdir(directory):
+        if not name.startswith('catalog-') or '.tmp-' in name:
+            continue
+        old_token, _, old_generation = name[len('catalog-'):].rpartition('-')
+        if old_token != token or (old_generation.isdigit() and int(old_generation) < generation - 1):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def build_snapshot():
+    """현재 세대의 스냅샷을 반환합니다. CATALOG_SNAPSHOT_DIR이 설정되어 있으면 세대별 파일로 저장해 워커들이 공유합니다."""
+    directory = current_app.config.get('CATALOG_SNAPSHOT_DIR')
+    version = catalog_version()
+    if not directory or '-' not in version: # 아직 세대 기록이 없는 DB는 메모리에만 만듭니다.
+        return CatalogSnapshot.from_db()
+
+    path = os.path.join(directory, f"catalog-{version}")
+    if not os.path.isdir(path):
+        os.makedirs(directory, exist_ok=True)
+        CatalogSnapshot.from_db().save(path)
+        _remove_old_snapshots(directory, version.rpartition('-')[0], catalog_generation())
+    try:
+        return CatalogSnapshot.load(path)
+    except FileNotFoundError:
+        # 세대가 연달아 바뀌어 다른 워커가 이 스냅샷을 지웠으면, 이 워커는 다음 세대까지 메모리에 만든 스냅샷을 씁니다.
+        return CatalogSnapshot.from_db()
+
+
+_snapshot = CatalogCache(build_snapshot)
+
+
+def get_catalog_snapshot():
+    """현재 카탈로그 버전의 스냅샷을 반환합니다."""
+    return _snapshot.get()
@@ -0,0 +1,228 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from flask import current_app, send_file
+from fileutil import atomic_write
+from pokeapi import RateLimitedFetcher
+
+try:
+    from PIL import Image
+except ImportError: # Pillow가 없으면 원본만 미러링하고 썸네일/스프라이트 시트는 만들지 않습니다.
+    Image = None
+
+# mirror-sprites가 image_url을 바꿔 넣는 로컬 주소의 접두사
+LOCAL_SPRITE_PREFIX = '/sprites/'
+THUMBNAIL_FORMATS = {'webp': 'image/webp', 'png': 'image/png'}
+
+
+def local_sprite_url(pokemon_id, digest):
+    """미러링한 스프라이트의 로컬 주소. v 값은 내용 해시라서 내용이 바뀌면 주소도 바뀝니다."""
+    return f"{LOCAL_SPRITE_PREFIX}{pokemon_id}?v={digest[:12]}"
+
+
+class SpriteStore:
+    """내용 해시(sha256)로 주소를 정하는 스프라이트 저장소
+
+    root/objects/<해시 앞 2자리>/<해시>에 이미지 바이트를, root/manifest.json에 포켓몬별 원본/썸네일 해시와
+    스프라이트 시트 목록을 저장합니다. 같은 이미지는 한 번만 저장됩니다.
+    """
+
+    def __init__(self, root, manifest=None):
+        self.root = root
+        self.manifest = manifest if manifest is not None else {'pokemon': {}, 'sheets': {}}
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, 'manifest.json')
+
+    @classmethod
+    def load(cls, root):
+        try:
+            with open(os.path.join(root, 'manifest.json'), encoding='utf-8') as f:
+                return cls(root, json.load(f))
+        except (OSError, ValueError):
+            return cls(root)
+
+    def save(self):
+        """manifest를 원자적으로 저장합니다."""
+        with atomic_write(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+
+    def object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.exists(self.object_path(digest))
+
+    def put(self, data):
+        """이미지 바이트를 저장하고 해시를 반환합니다. 이미 있으면 다시 쓰지 않습니다."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            with atomic_write(path) as f:
+                f.write(data)
+        return digest
+
+    def entry(self, pokemon_id):
+        return self.manifest['pokemon'].get(str(pokemon_id))
+
+    def lookup(self, pokemon_id, size=None, webp=False):
+        """(해시, MIME 타입)을 반환합니다. size 썸네일이 없으면 원본, 미러링하지 않았으면 None."""
+        entry = self.entry(pokemon_id)
+        if entry is None:
+            return None
+        thumbnails = entry.get('thumbnails', {}).get(str(size)) if size else None
+        if thumbnails:
+            image_format = 'webp' if webp and 'webp' in thumbnails else 'png'
+            if image_format in thumbnails:
+                return thumbnails[image_format], THUMBNAIL_FORMATS[image_format]
+        return entry['original'], entry.get('type') or 'image/png'
+
+
+class SpriteDownloader(RateLimitedFetcher):
+    """스프라이트 이미지를 병렬로 내려받습니다. (요청 속도 제한, 일시적 오류 재시도)"""
+
+    def fetch(self, url):
+        """(바이트, Content-Type)을 반환합니다. 끝내 가져오지 못하면 None."""
+        return self._get(url, f"sprite {url}", lambda response: (
+            response.content, response.headers.get('Content-Type', 'image/png').split(';')[0].strip()))
+
+
+def make_thumbnails(data, sizes):
+    """원본 이미지 바이트로 크기별 WebP/PNG 썸네일을 만들어 {크기: {형식: 바이트}}로 반환합니다."""
+    with Image.open(io.BytesIO(data)) as source:
+        source = source.convert('RGBA')
+        thumbnails = {}
+        for size in sizes:
+            image = source.copy()
+            image.thumbnail((size, size), Image.LANCZOS)
+            encoded = {}
+            for image_format, options in (('webp', {'quality': 85, 'method': 6}), ('png', {'optimize': True})):
+                buffer = io.BytesIO()
+                image.save(buffer, image_format.upper(), **options)
+                encoded[image_format] = buffer.getvalue()
+            thumbnails[size] = encoded
+        return thumbnails
+
+
+def build_sheets(store, pokemon_ids, size, columns=10, rows=10):
+    """size x size 칸에 스프라이트를 pokemon_id 순으로 배치한 WebP 스프라이트 시트들을 만들어 manifest에 기록합니다.
+
+    한 시트에는 columns x rows마리가 들어가며, 목록 화면은 시트 한 장으로 여러 이미지를 대신할 수 있습니다.
+    """
+    per_sheet = columns * rows
+    pokemon_ids = [pokemon_id for pokemon_id in sorted(pokemon_ids) if store.entry(pokemon_id)]
+    sheets = []
+    for start in range(0, len(pokemon_ids), per_sheet):
+        ids = pokemon_ids[start:start + per_sheet]
+        sheet = Image.new('RGBA', (columns * size, ((len(ids) + columns - 1) // columns) * size))
+        for position, pokemon_id in enumerate(ids):
+            digest, _ = store.lookup(pokemon_id, size)
+            with open(store.object_path(digest), 'rb') as f, Image.open(f) as image:
+                image = image.convert('RGBA')
+                image.thumbnail((size, size), Image.LANCZOS)
+                x = (position % columns) * size + (size - image.width) // 2
+                y = (position // columns) * size + (size - image.height) // 2
+                sheet.paste(image, (x, y), image)
+        buffer = io.BytesIO()
+        sheet.save(buffer, 'WEBP', quality=85, method=6)
+        sheets.append({'hash': store.put(buffer.getvalue()), 'ids': ids})
+    store.manifest['sheets'][str(size)] = {'size': size, 'columns': columns, 'sheets': sheets}
+    return sheets
+
+
+def _has_thumbnails(store, entry, size):
+    thumbnails = entry['thumbnails'].get(str(size))
+    return bool(thumbnails) and all(store.has(digest) for digest in thumbnails.values())
+
+
+def mirror_sprites(store, sources, sizes=(), downloader=None, force=False):
+    """{pokemon_id: 원본 URL}의 스프라이트를 저장소에 내려받고 썸네일을 만듭니다. (manifest 저장은 호출하는 쪽에서)
+
+    이미 같은 URL에서 받아 둔 포켓몬은 다시 받지 않고, 원본이 그대로면 썸네일도 다시 만들지 않습니다.
+    (받은 수, 건너뛴 수, 실패한 pokemon_id 목록)을 반환합니다.
+    """
+    entries = store.manifest['pokemon']
+    todo = {pokemon_id: url for pokemon_id, url in sources.items()
+            if force or not (entries.get(str(pokemon_id), {}).get('source') == url
+                             and store.has(entries[str(pokemon_id)]['original']))}
+    results = (downloader or SpriteDownloader()).fetch_many(todo.values()) if todo else {}
+
+    failed = []
+    for pokemon_id, url in todo.items():
+        result = results.get(url)
+        if result is None:
+            failed.append(pokemon_id)
+            continue
+        data, content_type = result
+        digest = store.put(data)
+        old = entries.get(str(pokemon_id), {})
+        entries[str(pokemon_id)] = {'source': url, 'original': digest, 'type': content_type,
+                                    'thumbnails': old.get('thumbnails', {}) if old.get('original') == digest else {}}
+
+    if sizes and Image is not None:
+        thumbnails_by_digest = {}
+        for pokemon_id in sources:
+            entry = entries.get(str(pokemon_id))
+            if entry is None:
+                continue
+            missing = [size for size in sizes if not _has_thumbnails(store, entry, size)]
+            if not missing:
+                continue
+            key = (entry['original'], tuple(missing))
+            if key not in thumbnails_by_digest:
+                with open(store.object_path(entry['original']), 'rb') as f:
+                    thumbnails_by_digest[key] = {
+                        str(size): {image_format: store.put(data) for image_format, data in encoded.items()}
+                        for size, encoded in make_thumbnails(f.read(), missing).items()
+                    }
+            entry['thumbnails'].update(thumbnails_by_digest[key])
+    return len(todo) - len(failed), len(sources) - len(todo), failed
+
+
+def sprite_store_dir():
+    return current_app.config.get('SPRITE_STORE_DIR') or os.path.join(current_app.instance_path, 'sprites')
+
+
+_loaded = {'key': None, 'store': None}
+_loaded_lock = threading.Lock()
+
+
+def get_sprite_store():
+    """현재 스프라이트 저장소. mirror-sprites가 manifest를 다시 쓰면 다음 요청에서 새로 읽습니다."""
+    root = sprite_store_dir()
+    try:
+        modified = os.stat(os.path.join(root, 'manifest.json')).st_mtime_ns
+    except OSError:
+        modified = None
+    key = (root, modified)
+    if _loaded['key'] != key:
+        with _loaded_lock:
+            if _loaded['key'] != key:
+                _loaded['store'] = SpriteStore.load(root)
+                _loaded['key'] = key
+    return _loaded['store']
+
+
+def source_url(image_url, entry, default_url=None):
+    """원래 스프라이트 URL. image_url이 이미 로컬 주소면 미러링할 때 기록한 URL, 그것도 없으면 default_url."""
+    if image_url and not image_url.startswith(LOCAL_SPRITE_PREFIX):
+        return image_url
+    if entry:
+        return entry['source']
+    return default_url
+
+
+def sprite_response(store, digest, mimetype, immutable=False):
+    """저장소의 이미지 응답. ETag는 내용 해시이고, immutable이면 1년 동안 캐시합니다."""
+    response = send_file(store.object_path(digest), mimetype=mimetype, etag=digest, conditional=True)
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    if immutable:
+        response.cache_control.max_age = 365 * 24 * 3600
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = current_app.config.get('SPRITE_MAX_AGE', 86400)
+    return response
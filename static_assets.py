@@ -0,0 +1,163 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from flask import current_app, jsonify, request, send_file
+from werkzeug.security import safe_join
+from fileutil import atomic_write
+
+try:
+    import brotli
+except ImportError: # brotli가 없으면 gzip으로만 미리 압축합니다.
+    brotli = None
+
+# 선호 순서대로 Content-Encoding -> 미리 압축한 파일의 확장자
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+COMPRESSORS = {
+    'br': (lambda data: brotli.compress(data, quality=11)) if brotli is not None else None,
+    'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0),
+}
+# 미리 압축하는 파일 종류와 최소 크기 (작은 파일은 압축해도 이득이 거의 없습니다)
+COMPRESSIBLE_SUFFIXES = ('.js', '.css', '.html', '.json', '.map', '.svg', '.txt', '.xml', '.ico')
+MIN_COMPRESS_SIZE = 1024
+# 빌드 시 내용 해시가 붙은 파일 (예: main.3f2a1b9c.js, 453.1e2d3c4b.chunk.css)은 내용이 바뀌면 이름도 바뀝니다.
+FINGERPRINTED = re.compile(r'\.[0-9a-f]{8,}\.')
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600 # 초
+
+
+def precompress(build_dir, min_size=MIN_COMPRESS_SIZE):
+    """빌드 디렉터리의 텍스트 파일마다 .gz(brotli가 설치되어 있으면 .br도) 파일을 만들고 만든 개수를 반환합니다.
+
+    원본보다 새로운 압축 파일이 이미 있으면 건너뛰므로 다시 실행해도 바뀐 파일만 압축합니다.
+    """
+    written = 0
+    for root, _, names in os.walk(build_dir):
+        for name in names:
+            if not name.endswith(COMPRESSIBLE_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            source = os.stat(path)
+            if source.st_size < min_size:
+                continue
+            data = None
+            for encoding, suffix in ENCODINGS.items():
+                compress = COMPRESSORS[encoding]
+                target = path + suffix
+                if compress is None or _is_fresh(target, source.st_mtime_ns):
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                compressed = compress(data)
+                if len(compressed) < len(data):
+                    with atomic_write(target) as f:
+                        f.write(compressed)
+                    written += 1
+                elif os.path.exists(target):
+                    os.remove(target)
+    return written
+
+
+def _is_fresh(path, source_mtime_ns):
+    try:
+        return os.stat(path).st_mtime_ns >= source_mtime_ns
+    except OSError:
+        return False
+
+
+def _accepts(encoding):
+    return request.accept_encodings[encoding] > 0
+
+
+class StaticAssets:
+    """React 빌드 파일 서빙
+
+    - 요청의 Accept-Encoding에 따라 미리 압축한 .br/.gz 파일을 보냅니다.
+    - 파일명에 해시가 붙은 파일은 1년 동안 immutable로 캐시하고, 나머지는 ETag로 재검증합니다.
+    - index.html은 (압축본과 함께) 메모리에 두고, 새로 빌드되면 다시 읽습니다.
+    """
+
+    def __init__(self, app=None):
+        self._index = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # 압축본은 시작할 때가 아니라 빌드 후 flask compress-static으로 만듭니다. (없으면 원본을 보냅니다)
+        app.config.setdefault('STATIC_BUILD_DIR', os.path.join(app.root_path, 'frontend', 'build'))
+        app.extensions['static_assets'] = self
+
+    @property
+    def build_dir(self):
+        return current_app.config['STATIC_BUILD_DIR']
+
+    def _load_index(self):
+        """메모리의 index.html 본문들을 반환합니다. 파일이 바뀌었으면 다시 읽고, 없으면 None."""
+        path = os.path.join(self.build_dir, 'index.html')
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        index = self._index
+        if index is None or index['key'] != key:
+            with self._lock:
+                index = self._index
+                if index is None or index['key'] != key:
+                    with open(path, 'rb') as f:
+                        body = f.read()
+                    bodies = {None: body}
+                    for encoding, compress in COMPRESSORS.items():
+                        if compress is not None:
+                            bodies[encoding] = compress(body)
+                    index = {'key': key, 'etag': hashlib.sha1(body).hexdigest(), 'bodies': bodies}
+                    self._index = index
+        return index
+
+    def index_response(self):
+        """index.html 응답 (매번 ETag로 재검증)"""
+        index = self._load_index()
+        if index is None:
+            return jsonify({"error": "프론트엔드 빌드(index.html)를 찾을 수 없습니다."}), 404
+        encoding = next((encoding for encoding in ENCODINGS if encoding in index['bodies'] and _accepts(encoding)), None)
+        response = current_app.response_class(index['bodies'][encoding], mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.set_etag(f"{index['etag']}-{encoding}" if encoding else index['etag'])
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def file_response(self, filename):
+        """빌드 디렉터리의 파일 응답. 파일이 없으면 None."""
+        path = safe_join(self.build_dir, filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        sent_path, encoding = path, None
+        if filename.endswith(COMPRESSIBLE_SUFFIXES):
+            source_mtime_ns = os.stat(path).st_mtime_ns
+            for candidate, suffix in ENCODINGS.items():
+                if _accepts(candidate) and _is_fresh(path + suffix, source_mtime_ns):
+                    sent_path, encoding = path + suffix, candidate
+                    break
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_file(sent_path, mimetype=mimetype, conditional=True)
+        if filename.endswith(COMPRESSIBLE_SUFFIXES):
+            response.vary.add('Accept-Encoding')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if FINGERPRINTED.search(os.path.basename(filename)):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return response
+
+
+static_assets = StaticAssets()
@@ -0,0 +1,107 @@
+import numpy as np
+from sqlalchemy import insert, or_
+from catalog import CatalogCache
+from models import db, chunked, Pokemon, Tag, PokemonTag
+
+# 태그가 ', '로 이어져 저장되는 컬럼들
+TAG_COLUMNS = ('type', 'role', 'feature', 'appearance')
+
+
+def split_tags(value):
+    """', '로 이어진 태그 문자열을 태그 리스트로 분리합니다."""
+    if not value:
+        return []
+    return [tag.strip() for tag in value.split(',') if tag.strip()]
+
+
+def sync_pokemon_tags(pokemon_ids=None):
+    """태그 컬럼 문자열로부터 Tag/PokemonTag 테이블을 다시 채웁니다. (commit은 호출한 쪽에서 합니다)
+
+    pokemon_ids가 None이면 전체 포켓몬을 다시 채웁니다. id가 많으면 MAX_IN_IDS개씩 나눠 조회하고 지웁니다.
+    """
+    columns = [getattr(Pokemon, col) for col in TAG_COLUMNS]
+    query = db.session.query(Pokemon.pokemon_id, *columns)
+    if pokemon_ids is None:
+        rows = query.all()
+    else:
+        pokemon_ids = list(pokemon_ids)
+        rows = [row for chunk in chunked(pokemon_ids) for row in query.filter(Pokemon.pokemon_id.in_(chunk))]
+
+    pairs = set()
+    for row in rows:
+        for category, value in zip(TAG_COLUMNS, row[1:]):
+            for tag in split_tags(value):
+                pairs.add((row[0], category, tag))
+
+    tag_ids = {(category, name): tag_id for tag_id, category, name in db.session.query(Tag.id, Tag.category, Tag.name)}
+    missing = {(category, tag) for _, category, tag in pairs} - tag_ids.keys()
+    if missing:
+        db.session.execute(insert(Tag), [{'category': category, 'name': name} for category, name in sorted(missing)])
+        tag_ids = {(category, name): tag_id for tag_id, category, name in db.session.query(Tag.id, Tag.category, Tag.name)}
+
+    if pokemon_ids is None:
+        PokemonTag.query.delete(synchronize_session=False)
+    else:
+        for chunk in chunked(pokemon_ids):
+            PokemonTag.query.filter(PokemonTag.pokemon_id.in_(chunk)).delete(synchronize_session=False)
+
+    if pairs:
+        db.session.execute(insert(PokemonTag), [
+            {'pokemon_id': pokemon_id, 'tag_id': tag_ids[(category, tag)], 'category': category}
+            for pokemon_id, category, tag in pairs
+        ])
+    return len(pairs)
+
+
+def tags_need_migration():
+    """포켓몬은 있는데 태그 연결(PokemonTag)이 하나도 없으면 True. (flask migrate-tags를 실행하지 않은 기존 DB)"""
+    return (db.session.query(PokemonTag.pokemon_id).first() is None
+            and db.session.query(Pokemon.id).filter(or_(*[getattr(Pokemon, col) != '' for col in TAG_COLUMNS])).first() is not None)
+
+
+class TagIndex:
+    """(카테고리, 태그) -> 포켓몬 비트셋 역색인"""
+
+    def __init__(self, pokemon_ids, links):
+        # pokemon_ids: 전체 포켓몬 id 목록, links: (pokemon_id, category, tag) 튜플 목록
+        self.ids = np.array(sorted(pokemon_ids), dtype=np.int64)
+        positions = {pokemon_id: position for position, pokemon_id in enumerate(self.ids.tolist())}
+        self._postings = {}
+        for pokemon_id, category, tag in links:
+            position = positions.get(pokemon_id)
+            if position is None:
+                continue
+            key = (category, tag)
+            if key not in self._postings:
+                self._postings[key] = np.zeros(len(self.ids), dtype=bool)
+            self._postings[key][position] = True
+
+    @classmethod
+    def from_db(cls):
+        """정규화된 태그 테이블에서 색인을 만듭니다."""
+        pokemon_ids = [row[0] for row in db.session.query(Pokemon.pokemon_id)]
+        links = (db.session.query(PokemonTag.pokemon_id, PokemonTag.category, Tag.name)
+                 .join(Tag, Tag.id == PokemonTag.tag_id)
+                 .all())
+        return cls(pokemon_ids, links)
+
+    def match(self, selected_filters):
+        """선택된 모든 태그를 가진 포켓몬의 pokemon_id 목록을 반환합니다. 선택된 태그가 없으면 None."""
+        mask = None
+        for category, tags in (selected_filters or {}).items():
+            for tag in tags or []:
+                posting = self._postings.get((category, tag))
+                if posting is None:
+                    return []
+                mask = posting.copy() if mask is None else np.logical_and(mask, posting, out=mask)
+        if mask is None:
+            return None
+        return self.ids[mask].tolist()
+
+
+_index = CatalogCache(TagIndex.from_db)
+
+
+def get_tag_index():
+    """현재 카탈로그 버전의 태그 색인을 반환합니다."""
+    return _index.get()
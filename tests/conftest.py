@@ -0,0 +1,90 @@
+import os
+import types
+import pytest
+
+
+class FakeClock:
+    """모듈의 time 대신 쓰는 가짜 시계 (sleep하면 시간만 앞으로 갑니다)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """fake_clock(모듈)은 그 모듈의 time을 새 가짜 시계로 바꾸고 시계를 반환합니다."""
+    def install(module):
+        clock = FakeClock()
+        monkeypatch.setattr(module, 'time', types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+        return clock
+    return install
+
+
+@pytest.fixture(scope='session')
+def flask_app(tmp_path_factory):
+    """임시 SQLite DB를 쓰는 app.py의 Flask 앱 (app 모듈은 DATABASE_URL을 설정한 뒤에 불러와야 합니다)"""
+    workdir = tmp_path_factory.mktemp('app')
+    os.environ['DATABASE_URL'] = f"sqlite:///{workdir / 'test.db'}"
+    os.environ['CATALOG_SNAPSHOT_DIR'] = str(workdir / 'catalog')
+    os.environ['PASSWORD_HASH_WORKERS'] = '0'
+    os.environ['BCRYPT_LOG_ROUNDS'] = '4'
+    os.environ['JWT_SECRET_KEY'] = 'test-secret-key-that-is-long-enough'
+    os.environ.pop('RECOMMEND_CACHE_URL', None)
+    from app import app
+    app.config.update(TESTING=True, CATALOG_CHECK_INTERVAL=0)
+    return app
+
+
+@pytest.fixture
+def app(flask_app, monkeypatch):
+    """테스트마다 빈 DB로 시작하는 앱 컨텍스트 (사용자별 '좋아요' 캐시도 비웁니다)"""
+    import profiles
+    from catalog import bump_catalog_version
+    from models import db
+    monkeypatch.setattr(profiles, '_liked_cache', profiles.LikedIdsCache())
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        bump_catalog_version()
+        yield flask_app
+        db.session.remove()
+
+
+@pytest.fixture
+def add_pokemon(app):
+    """add_pokemon((pokemon_id, type, role), ...)은 포켓몬을 추가하고 태그 테이블을 채웁니다."""
+    from models import db, Pokemon
+    from tag_index import sync_pokemon_tags
+
+    def add(*pokemon):
+        for pokemon_id, type_, role in pokemon:
+            db.session.add(Pokemon(pokemon_id=pokemon_id, name_ko=f'포켓몬{pokemon_id}', name_en=f'Pokemon{pokemon_id}',
+                                   type=type_, role=role, feature='', appearance=''))
+        db.session.flush()
+        sync_pokemon_tags()
+        db.session.commit()
+    return add
+
+
+@pytest.fixture
+def add_user(app):
+    """add_user(이름, is_admin)은 사용자를 추가하고 (user_id, Authorization 헤더)를 반환합니다."""
+    from flask_jwt_extended import create_access_token
+    from models import db, User
+    from user_cache import token_claims
+
+    def add(username, is_admin=False):
+        user = User(username=username, password_hash='unused', is_admin=is_admin)
+        db.session.add(user)
+        db.session.commit()
+        token = create_access_token(identity=str(user.id), additional_claims=token_claims(user))
+        return user.id, {'Authorization': f'Bearer {token}'}
+    return add
@@ -0,0 +1,49 @@
+import pytest
+from models import db, Pokemon, PokemonTag, Tag
+
+
+@pytest.fixture
+def admin_headers(app, add_pokemon, add_user):
+    add_pokemon((1, '물', '방어형'), (2, '불꽃', '물리 공격형'), (3, '풀', '방어형'))
+    return add_user('admin', is_admin=True)[1]
+
+
+def pokemon(pokemon_id):
+    return Pokemon.query.filter_by(pokemon_id=pokemon_id).one()
+
+
+def bulk(app, headers, *patches):
+    return app.test_client().patch('/api/admin/pokemon/bulk', json={'patches': list(patches)}, headers=headers)
+
+
+def test_matching_row_version_updates_and_increments_it(app, admin_headers):
+    response = bulk(app, admin_headers, {'pokemon_id': 1, 'type': '얼음', 'row_version': 1}, {'pokemon_id': 2, 'name_en': 'Blaze'})
+    assert response.status_code == 200
+    assert (pokemon(1).type, pokemon(1).row_version) == ('얼음', 2)
+    assert (pokemon(2).name_en, pokemon(2).row_version) == ('Blaze', 2)
+    # 태그 컬럼을 바꾼 포켓몬은 태그 연결도 다시 채워집니다.
+    assert {name for (name,) in db.session.query(Tag.name).join(PokemonTag, PokemonTag.tag_id == Tag.id)
+            .filter(PokemonTag.pokemon_id == 1, PokemonTag.category == 'type')} == {'얼음'}
+
+
+def test_stale_row_version_rejects_and_rolls_back_the_whole_batch(app, admin_headers):
+    assert bulk(app, admin_headers, {'pokemon_id': 3, 'name_en': 'Leafy'}).status_code == 200 # 3의 row_version은 2가 됩니다.
+
+    response = bulk(app, admin_headers,
+                    {'pokemon_id': 1, 'name_en': 'Changed', 'row_version': 1},
+                    {'pokemon_id': 2, 'type': '얼음'},
+                    {'pokemon_id': 3, 'name_en': 'Stale', 'row_version': 1})
+    assert response.status_code == 409
+    assert response.json['conflicts'] == [3]
+    # 버전이 맞았던 1과 버전 없이 보낸 2도 바뀌지 않습니다.
+    assert [(pokemon(pokemon_id).name_en, pokemon(pokemon_id).row_version) for pokemon_id in (1, 2, 3)] == [
+        ('Pokemon1', 1), ('Pokemon2', 1), ('Leafy', 2)]
+    assert pokemon(2).type == '불꽃'
+
+
+@pytest.mark.parametrize('row_version', [True, False, '1', 1.0])
+def test_non_integer_row_version_is_rejected(app, admin_headers, row_version):
+    response = bulk(app, admin_headers, {'pokemon_id': 1, 'name_en': 'X', 'row_version': row_version})
+    assert response.status_code == 400
+    assert response.json['errors'] == [{'index': 0, 'error': "row_version은 정수여야 합니다."}]
+    assert pokemon(1).name_en == 'Pokemon1'
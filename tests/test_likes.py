@@ -0,0 +1,57 @@
+import pytest
+from models import db, Tag, UserTagCount
+from profiles import apply_like_changes, likes_version, set_likes
+
+
+@pytest.fixture
+def trainer(app, add_pokemon, add_user):
+    add_pokemon((1, '물', '방어형'), (2, '물, 불꽃', '물리 공격형'), (3, '풀', '방어형'), (4, '전기', '스피드형'))
+    user_id, headers = add_user('trainer')
+    set_likes(user_id, [1, 2])
+    apply_like_changes(user_id, [1, 2])
+    db.session.commit()
+    return user_id, headers
+
+
+def type_counts(user_id):
+    return {name: num_likes for name, num_likes in
+            db.session.query(Tag.name, UserTagCount.num_likes).join(UserTagCount, UserTagCount.tag_id == Tag.id)
+            .filter(UserTagCount.user_id == user_id, Tag.category == 'type')}
+
+
+def test_batch_overlapping_existing_likes_only_counts_real_changes(app, trainer):
+    user_id, headers = trainer
+    # 2는 이미 '좋아요'한 포켓몬이므로 다시 세지 않고, 4는 '좋아요'한 적이 없으므로 취소할 것이 없습니다.
+    response = app.test_client().post('/api/likes/batch', json={'like': [2, 3], 'unlike': [1, 4]}, headers=headers)
+    assert response.status_code == 200
+    assert response.json == {'liked': [3], 'unliked': [1], 'liked_pokemon_ids': [2, 3]}
+    assert type_counts(user_id) == {'물': 1, '불꽃': 1, '풀': 1}
+    assert likes_version(user_id) == 2
+
+
+def test_batch_with_nothing_to_change_keeps_likes_version(app, trainer):
+    user_id, headers = trainer
+    response = app.test_client().post('/api/likes/batch', json={'like': [1, 2], 'unlike': [4]}, headers=headers)
+    assert response.json == {'liked': [], 'unliked': [], 'liked_pokemon_ids': [1, 2]}
+    assert likes_version(user_id) == 1
+
+
+def test_set_likes_returns_only_rows_that_changed(trainer):
+    user_id, _ = trainer
+    assert set_likes(user_id, like_ids=[1, 3], unlike_ids=[2, 4]) == ([3], [2])
+
+
+@pytest.mark.parametrize('body', [
+    {'like': '25'}, {'like': {'3': 1}}, {'like': True}, {'like': [True]}, {'like': ['4']}, {'unlike': [1.5]}, [1, 2],
+])
+def test_batch_rejects_anything_but_integer_id_lists(app, trainer, body):
+    user_id, headers = trainer
+    response = app.test_client().post('/api/likes/batch', json=body, headers=headers)
+    assert response.status_code == 400
+    assert likes_version(user_id) == 1
+
+
+def test_batch_rejects_the_same_pokemon_in_like_and_unlike(app, trainer):
+    _, headers = trainer
+    response = app.test_client().post('/api/likes/batch', json={'like': [3], 'unlike': [3]}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,44 @@
+import pytest
+from flask import Flask, Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from metrics import metrics
+
+
+@pytest.fixture
+def metrics_app():
+    # SQL 이벤트는 Engine 클래스 전체에 한 번만 등록되므로 (app.py가 쓰는) 전역 metrics를 그대로 씁니다.
+    app = Flask(__name__)
+    metrics.init_app(app)
+    engine = app.engine = create_engine('sqlite://')
+
+    @app.route('/queries')
+    def queries():
+        with engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.execute(text('SELECT * FROM no_such_table'))
+            connection.execute(text('SELECT 1'))
+        return 'ok'
+
+    @app.route('/stream')
+    def stream():
+        return Response((chunk for chunk in ['가나다', 'abc', b'\x00\x01']), mimetype='text/plain')
+
+    return app
+
+
+def test_failed_statement_does_not_leak_a_start_time(metrics_app):
+    metrics_app.test_client().get('/queries')
+    stats = metrics.endpoints['queries']
+    # 실패한 쿼리는 세지 않고, 성공한 쿼리는 자기 시작 시각과 짝지어집니다.
+    assert stats.queries.sum == 1
+    assert 0 < stats.query_seconds < 1
+    with metrics_app.engine.connect() as connection: # 같은 DB 연결을 다시 받아도 남은 시작 시각이 없습니다.
+        assert not connection.info
+
+
+def test_streamed_response_counts_bytes_actually_sent(metrics_app):
+    response = metrics_app.test_client().get('/stream')
+    assert response.data == '가나다abc'.encode('utf-8') + b'\x00\x01'
+    response.close()
+    assert metrics.endpoints['stream'].response_bytes == len(response.data)
@@ -0,0 +1,23 @@
+import pytest
+from pagination import InvalidCursor, decode_cursor, keyset_slice
+
+
+def test_keyset_slice_walks_sorted_keys_page_by_page():
+    keys = [2, 3, 5, 8, 13, 21, 34]
+    pages, cursor = [], ''
+    while cursor is not None:
+        page, cursor = keyset_slice(keys, cursor, 3)
+        pages.append(page)
+    assert pages == [[2, 3, 5], [8, 13, 21], [34]]
+
+
+def test_keyset_slice_resumes_after_a_key_that_is_gone():
+    _, cursor = keyset_slice([1, 2, 3, 4], '', 2)
+    assert decode_cursor(cursor) == 2
+    # 커서의 키(2)가 목록에서 빠져도 그 다음 키부터 이어집니다.
+    assert keyset_slice([1, 3, 4], cursor, 2) == ([3, 4], None)
+
+
+def test_keyset_slice_rejects_bad_cursor():
+    with pytest.raises(InvalidCursor):
+        keyset_slice([1, 2], 'not-a-cursor!', 10)
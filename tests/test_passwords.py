@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+import textwrap
+import bcrypt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 메인 모듈을 다시 불러오는 forkserver/spawn 워커로 실제 풀을 실행하므로 별도 프로세스의 스크립트로 확인합니다.
+SCRIPT = textwrap.dedent("""
+    from flask import Flask
+    from passwords import PasswordHasher
+
+    app = Flask(__name__)
+    app.config.update(BCRYPT_LOG_ROUNDS=4, PASSWORD_HASH_WORKERS=2, PASSWORD_HASH_TIMEOUT=30)
+    hasher = PasswordHasher(app)
+
+    if __name__ == '__main__':
+        with app.app_context():
+            password_hash = hasher.hash('pikachu')
+            print(password_hash)
+            print(hasher.check(password_hash, 'pikachu'), hasher.check(password_hash, 'raichu'))
+""")
+
+
+def test_pool_runs_from_guarded_script(tmp_path):
+    script = tmp_path / 'hash_script.py'
+    script.write_text(SCRIPT, encoding='utf-8')
+    result = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=60,
+                            env={**os.environ, 'PYTHONPATH': ROOT}, check=False)
+    assert result.returncode == 0, result.stderr
+    password_hash, checks = result.stdout.splitlines()
+    assert bcrypt.checkpw(b'pikachu', password_hash.encode('utf-8'))
+    assert checks == 'True False'
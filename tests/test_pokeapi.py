@@ -0,0 +1,71 @@
+import pytest
+import requests
+import pokeapi
+from pokeapi import SpeciesFetcher, TokenBucket
+
+
+class StubSession:
+    """정해 둔 (상태 코드, 본문)을 차례로 돌려주는 requests.Session 대역"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        status, body = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response._content = body.encode('utf-8')
+        return response
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(pokeapi)
+
+
+def make_fetcher(session, cache_dir=None, **kwargs):
+    kwargs.setdefault('rate', 1000)
+    return SpeciesFetcher(base_url='http://stub/species/{id}/', cache_dir=cache_dir, session=session, **kwargs)
+
+
+def test_retries_with_backoff_on_429_and_5xx(clock):
+    session = StubSession((429, ''), (503, ''), (200, '{"id": 1}'))
+    fetcher = make_fetcher(session, retries=3, backoff=0.5)
+
+    assert fetcher.fetch(1) == {'id': 1}
+    assert session.urls == ['http://stub/species/1/'] * 3
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_gives_up_after_retries_and_does_not_retry_client_errors(clock):
+    session = StubSession((500, ''), (502, ''), (504, ''))
+    assert make_fetcher(session, retries=2, backoff=0.1).fetch(1) is None
+    assert len(session.urls) == 3
+
+    session = StubSession((404, ''))
+    assert make_fetcher(session, retries=2).fetch(1) is None
+    assert len(session.urls) == 1
+
+
+def test_cache_hit_skips_network(clock, tmp_path):
+    session = StubSession((200, '{"id": 25, "name": "pikachu"}'))
+    assert make_fetcher(session, cache_dir=str(tmp_path)).fetch(25) == {'id': 25, 'name': 'pikachu'}
+
+    offline = StubSession() # 요청하면 pop()에서 IndexError가 납니다.
+    assert make_fetcher(offline, cache_dir=str(tmp_path)).fetch(25) == {'id': 25, 'name': 'pikachu'}
+    assert offline.urls == []
+
+
+def test_requests_are_rate_limited(clock):
+    session = StubSession(*[(200, '{}')] * 5)
+    fetcher = make_fetcher(session, rate=2)
+    fetcher.bucket = TokenBucket(2, capacity=1)
+
+    for species_id in range(5):
+        fetcher.fetch(species_id)
+    # 첫 요청 뒤로는 초당 2개씩만 나갑니다.
+    assert clock.now == pytest.approx(2.0)
+    assert len(session.urls) == 5
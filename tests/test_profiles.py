@@ -0,0 +1,58 @@
+import pytest
+from models import db, Pokemon, Tag, UserLike, UserTagCount
+from profiles import apply_like_changes, likes_version, rebuild_profiles_for_pokemon, rebuild_user_profiles, set_likes
+from tag_index import sync_pokemon_tags
+
+
+def tag_counts(user_id):
+    """사용자 태그 프로필을 {(카테고리, 태그): '좋아요' 수}로 반환합니다."""
+    return {(category, name): num_likes for category, name, num_likes in
+            db.session.query(Tag.category, Tag.name, UserTagCount.num_likes)
+            .join(UserTagCount, UserTagCount.tag_id == Tag.id).filter(UserTagCount.user_id == user_id)}
+
+
+def rebuilt_counts(user_id):
+    """UserLike로부터 처음부터 다시 계산한 프로필 (증분 계산과 비교용)"""
+    rebuild_user_profiles([user_id])
+    return tag_counts(user_id)
+
+
+@pytest.fixture
+def user_id(app, add_pokemon, add_user):
+    add_pokemon((1, '물', '방어형'), (2, '물, 불꽃', '물리 공격형'), (3, '풀', '방어형'))
+    return add_user('trainer')[0]
+
+
+def test_like_and_unlike_increment_and_decrement_tag_counts(user_id):
+    set_likes(user_id, [1, 2])
+    assert apply_like_changes(user_id, [1, 2]) == 1 # 프로필이 없던 사용자는 전체 '좋아요'로 만듭니다.
+    assert tag_counts(user_id) == {('type', '물'): 2, ('type', '불꽃'): 1, ('role', '방어형'): 1, ('role', '물리 공격형'): 1}
+
+    db.session.add(UserLike(user_id=user_id, pokemon_id=3))
+    db.session.flush()
+    assert apply_like_changes(user_id, added_ids=[3]) == 2
+    assert tag_counts(user_id)[('role', '방어형')] == 2
+    assert tag_counts(user_id)[('type', '풀')] == 1
+
+    assert set_likes(user_id, unlike_ids=[2]) == ([], [2])
+    assert apply_like_changes(user_id, removed_ids=[2]) == 3
+    # 0이 된 태그는 프로필에서 빠집니다.
+    expected = {('type', '물'): 1, ('type', '풀'): 1, ('role', '방어형'): 2}
+    assert tag_counts(user_id) == expected
+    assert rebuilt_counts(user_id) == expected
+
+
+def test_rebuild_profiles_for_pokemon_follows_tag_changes(user_id, add_user):
+    other_id = add_user('other')[0]
+    for uid, liked in ((user_id, [1, 3]), (other_id, [3])):
+        set_likes(uid, liked)
+        apply_like_changes(uid, liked)
+    db.session.commit()
+
+    db.session.query(Pokemon).filter_by(pokemon_id=1).update({'type': '얼음'})
+    sync_pokemon_tags([1])
+    rebuild_profiles_for_pokemon([1])
+    assert tag_counts(user_id) == {('type', '얼음'): 1, ('type', '풀'): 1, ('role', '방어형'): 2}
+    assert tag_counts(other_id) == {('type', '풀'): 1, ('role', '방어형'): 1}
+    # 프로필을 다시 계산해도 likes_version은 그대로입니다. ('좋아요' 목록은 바뀌지 않음)
+    assert likes_version(user_id) == 1
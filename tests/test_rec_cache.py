@@ -0,0 +1,77 @@
+import pytest
+from flask import Flask
+import rec_cache
+from rec_cache import InProcessBackend, RecommendationCache, RedisBackend
+
+
+class FakeRedis:
+    """get/set(ex=...)만 구현한 Redis 대역 (만료 시간은 기록만 합니다)"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(rec_cache)
+
+
+def test_in_process_backend_evicts_least_recently_used_by_bytes(clock):
+    backend = InProcessBackend(max_bytes=10)
+    backend.set('a', b'aaaa', ttl=60)
+    backend.set('b', b'bbbb', ttl=60)
+    assert backend.get('a') == b'aaaa' # a가 가장 최근에 사용한 항목이 됩니다.
+
+    backend.set('c', b'cccc', ttl=60)
+    assert backend.get('b') is None
+    assert backend.get('a') == b'aaaa'
+    assert backend.get('c') == b'cccc'
+    assert backend.size == 8
+
+    backend.set('a', b'aa', ttl=60) # 같은 키를 덮어쓰면 크기도 다시 계산합니다.
+    assert backend.size == 6
+    backend.set('huge', b'x' * 11, ttl=60) # 상한보다 큰 값은 저장하지 않습니다.
+    assert backend.get('huge') is None
+    assert backend.stats() == {'backend': 'memory', 'entries': 2, 'bytes': 6, 'max_bytes': 10}
+
+
+def test_in_process_backend_expires_entries_after_ttl(clock):
+    backend = InProcessBackend(max_bytes=100)
+    backend.set('a', b'value', ttl=30)
+    clock.now = 29
+    assert backend.get('a') == b'value'
+    clock.now = 31
+    assert backend.get('a') is None
+    assert backend.size == 0
+
+
+def test_cache_with_redis_backend_counts_hits_and_passes_ttl():
+    client = FakeRedis()
+    cache = RecommendationCache()
+    cache.backend = RedisBackend(client)
+    cache.ttl = 120
+    key = RecommendationCache.make_key(7, 3, 'token-5', 'neighbors')
+
+    assert cache.get(key) is None
+    cache.set(key, b'{"groups": []}')
+    assert cache.get(key) == b'{"groups": []}'
+    assert client.expiry == {'rec:7:3:token-5:neighbors': 120}
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'backend': 'redis'}
+
+
+def test_init_app_uses_process_memory_without_url():
+    app = Flask(__name__)
+    app.config.update(RECOMMEND_CACHE_TTL=10, RECOMMEND_CACHE_MAX_BYTES=1024)
+    cache = RecommendationCache(app)
+    assert isinstance(cache.backend, InProcessBackend)
+    assert cache.backend.max_bytes == 1024
+    assert cache.ttl == 10
+    assert app.extensions['recommendation_cache'] is cache
@@ -0,0 +1,57 @@
+import threading
+import time
+from flask import current_app
+from models import db, User
+
+# 권한 변경(다른 워커 프로세스에서의 변경 포함)이 반영되기까지의 최대 시간 (초)
+DEFAULT_TTL = 30
+
+
+class UserCache:
+    """사용자 권한 정보(username, is_admin, token_version)를 짧은 시간 보관하는 프로세스 단위 캐시"""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._entries = {} # user_id -> (만료 시각, 레코드 또는 None)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """사용자 레코드(딕셔너리)를 반환합니다. 없는 사용자면 None."""
+        user_id = int(user_id)
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        row = (db.session.query(User.id, User.username, User.is_admin, User.token_version)
+               .filter_by(id=user_id).first())
+        record = dict(row._mapping) if row else None
+        ttl = current_app.config.get('USER_CACHE_TTL', DEFAULT_TTL)
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                self._entries = {key: value for key, value in self._entries.items() if value[0] > now}
+            self._entries[user_id] = (now + ttl, record)
+        return record
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(int(user_id), None)
+
+
+user_cache = UserCache()
+
+
+def token_claims(user):
+    """access token에 넣을 추가 claim (관리자 여부와 토큰 버전)"""
+    return {'is_admin': bool(user.is_admin), 'ver': user.token_version or 0}
+
+
+def claims_match(claims, record):
+    """토큰의 claim이 현재 사용자 레코드와 일치하는지 확인합니다. 토큰 버전이 다르면 폐기된 토큰입니다."""
+    return record is not None and claims.get('ver') == record['token_version']
+
+
+def revoke_tokens(user):
+    """사용자의 토큰 버전을 올려 이미 발급된 토큰을 무효화합니다. 권한이나 비밀번호를 바꿀 때 호출하세요. (commit은 호출한 쪽에서)"""
+    user.token_version = (user.token_version or 0) + 1
+    user_cache.invalidate(user.id)
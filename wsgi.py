@@ -0,0 +1,9 @@
+"""WSGI 진입점
+
+여러 워커 프로세스로 실행하는 예:
+    gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app
+    waitress-serve --port=5000 --threads=8 wsgi:app
+"""
+from app import app
+
+application = app